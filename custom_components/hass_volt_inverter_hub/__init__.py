@@ -2,17 +2,34 @@
 """Entrypoint integracji Volt Inverter Hub."""
 from __future__ import annotations
 
+import asyncio
 import async_timeout
 import logging
+import time
+from functools import partial
 import voluptuous as vol
-from pymodbus.client import AsyncModbusSerialClient
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform
-from homeassistant.core import HomeAssistant
-from homeassistant.exceptions import ConfigEntryNotReady
+from homeassistant.core import HomeAssistant, ServiceCall, SupportsResponse, callback
+from homeassistant.exceptions import (
+    ConfigEntryError,
+    ConfigEntryNotReady,
+    ServiceValidationError,
+)
+from homeassistant.helpers import config_validation as cv
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import entity_registry as er
 
-from .const import DOMAIN, MODEL_CONFIGS
-from .coordinator import VoltCoordinator
+from .const import DOMAIN
+from .bus import DATA_BUS_LOCKS, DATA_BUSES, BusManager, rtu_frame_gap
+from .coordinator import DEFAULT_CONFIG_SWEEP, DEFAULT_CYCLE_BUDGET, VoltCoordinator
+from .derived import DerivedEngine
+from .planner import DEFAULT_MAX_GAP
+from .recorder import TrafficRecorder
+from .model_loader import async_get_model
+from .register_map import RegisterMapError
+from .tracing import DATA_TRACER, DEFAULT_TRACE_DURATION, MAX_TRACE_DURATION, Tracer
+from .transport import TRANSPORT_SERIAL, create_client, describe
 
 _LOGGER = logging.getLogger(__name__)
 PLATFORMS: list[Platform] = [
@@ -25,62 +42,218 @@ PLATFORMS: list[Platform] = [
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Utwórz klienta Modbus, koordynatora i zarejestruj encje."""
+    setup_started = time.monotonic()
     cfg = entry.data
-    model_cfg = MODEL_CONFIGS[cfg["model"]]
-
-    client = AsyncModbusSerialClient(
-        port=cfg["port"],
-        baudrate=cfg["baudrate"],
-        parity="N",
-        stopbits=1,
-        bytesize=8,
-        timeout=1,
-    )
 
-    # szybki test połączenia
+    # mapa modelu z models/<model>.yaml – skompilowana i zwalidowana raz
+    # (potem z cache na dysku), wspólna dla wpisów tego samego modelu
     try:
-        async with async_timeout.timeout(3):
-            await client.connect()
-            if not client.connected:
-                raise ConfigEntryNotReady("Serial port busy / not found")
-    except Exception as exc:
-        _LOGGER.debug("Modbus connect error: %s", exc)
-        client.close()
-        raise ConfigEntryNotReady("Serial port init failed") from exc
+        model_cfg, table = await async_get_model(
+            hass, cfg["model"], adaptive=entry.options.get("adaptive_polling", False)
+        )
+        derived = DerivedEngine(table)
+    except RegisterMapError as exc:
+        raise ConfigEntryError(f"Invalid register map: {exc}") from exc
+
+    # unique_id encji sprzed obsługi kilku slave'ów – bez prefiksu wpisu
+    await _async_migrate_unique_ids(hass, entry)
+
+    slave = cfg.get("slave", model_cfg["default_slave"])
+    bus = await _async_acquire_bus(hass, cfg, model_cfg)
+    bus.attach(slave)
 
     coordinator = VoltCoordinator(
         hass,
-        client=client,
-        slave=cfg.get("slave", model_cfg["default_slave"]),
-        registers=model_cfg["registers"],
+        bus=bus,
+        slave=slave,
+        table=table,
+        derived=derived,
+        max_gap=model_cfg.get("max_gap", DEFAULT_MAX_GAP),
+        # FC16 – część firmware'ów obsługuje tylko zapis pojedynczy (FC06)
+        write_multiple=model_cfg.get("write_multiple", True),
+        cycle_budget=model_cfg.get("cycle_budget", DEFAULT_CYCLE_BUDGET),
+        tracer=hass.data.setdefault(DATA_TRACER, Tracer()),
+        # przegląd nastaw: opcja wpisu > konfiguracja modelu > domyślny
+        config_sweep=entry.options.get(
+            "config_sweep", model_cfg.get("config_sweep", DEFAULT_CONFIG_SWEEP)
+        ),
     )
     # potrzebne, by grupować encje w Devices
-    coordinator.entry_id = entry.entry_id
-    coordinator.model_name = model_cfg["name"]
+    await coordinator.async_setup_devices(
+        entry.entry_id, model_cfg["name"], model_cfg["default_slave"]
+    )
+    if entry.options.get("record_traffic"):
+        # <config>/volt_traffic/<entry_id>.vrec – do scripts/replay_traffic.py
+        coordinator.recorder = TrafficRecorder(
+            hass.config.path("volt_traffic", f"{entry.entry_id}.vrec")
+        )
+    # rejestry wyłączonych encji nie są odpytywane (przed pierwszym odczytem)
+    coordinator.async_track_entity_registry(entry)
+    # zmiana opcji → przeładowanie wpisu
+    entry.async_on_unload(entry.add_update_listener(_async_options_updated))
 
-    await coordinator.async_config_entry_first_refresh()
+    try:
+        # start etapami: zestaw krytyczny teraz, reszta w tle po platformach
+        await coordinator.async_staged_first_refresh(
+            model_cfg.get("critical", ()), setup_started
+        )
+    except Exception:
+        _release_bus(hass, bus, slave)
+        raise
+    coordinator.async_start_polling(entry)
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    started = time.monotonic()
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
-
-    # awaryjny serwis „write_register”
-    async def async_write_register(call):
-        addr = call.data["address"]
-        value = call.data["value"]
-        await client.write_register(addr, value, slave=coordinator.slave)
-
-    hass.services.async_register(
-        DOMAIN,
-        "write_register",
-        async_write_register,
-        schema=vol.Schema({"address": vol.Coerce(int), "value": vol.Coerce(int)}),
+    _LOGGER.debug(
+        "Platform setup for %s took %.3f s", entry.title, time.monotonic() - started
     )
 
+    # awaryjny serwis „write_register” – wspólny dla wpisów, cel: urządzenie / slave
+    if not hass.services.has_service(DOMAIN, "write_register"):
+        hass.services.async_register(
+            DOMAIN,
+            "write_register",
+            partial(_async_write_register, hass),
+            schema=vol.Schema(
+                {
+                    vol.Required("address"): vol.Coerce(int),
+                    vol.Required("value"): vol.Coerce(int),
+                    vol.Optional("device_id"): cv.string,
+                    vol.Optional("slave"): vol.Coerce(int),
+                }
+            ),
+        )
+
+    # śledzenie etapów odpytywania na N sekund → Chrome trace JSON
+    async def async_start_trace(call: ServiceCall):
+        tracer: Tracer = hass.data[DATA_TRACER]
+        path = tracer.async_start(hass, call.data["duration"])
+        return {"path": path}
+
+    if not hass.services.has_service(DOMAIN, "start_trace"):
+        hass.services.async_register(
+            DOMAIN,
+            "start_trace",
+            async_start_trace,
+            schema=vol.Schema(
+                {
+                    vol.Optional("duration", default=DEFAULT_TRACE_DURATION): vol.All(
+                        vol.Coerce(float), vol.Range(min=1, max=MAX_TRACE_DURATION)
+                    )
+                }
+            ),
+            supports_response=SupportsResponse.OPTIONAL,
+        )
+
     return True
 
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Graceful unload."""
+    if not await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
+        return False
     coordinator: VoltCoordinator = hass.data[DOMAIN].pop(entry.entry_id)
-    coordinator.client.close()
-    return await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
\ No newline at end of file
+    # najpierw pętla odpytywania i kolejka zapisów, dopiero potem magistrala –
+    # inaczej transakcja w locie trafiłaby na zamknięty port
+    await coordinator.async_shutdown()
+    if coordinator.recorder is not None:
+        await coordinator.recorder.async_flush(hass)
+    _release_bus(hass, coordinator.bus, coordinator.slave)
+    if not hass.data[DOMAIN]:
+        # ostatni wpis – serwisy domeny znikają razem z nim
+        for service in ("write_register", "start_trace"):
+            hass.services.async_remove(DOMAIN, service)
+    return True
+
+
+async def _async_migrate_unique_ids(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Dodaj prefiks wpisu do unique_id encji (stare wpisy: sam klucz rejestru)."""
+    prefix = f"{entry.entry_id}_"
+
+    @callback
+    def migrate(reg_entry: er.RegistryEntry) -> dict[str, str] | None:
+        if reg_entry.unique_id.startswith(prefix):
+            return None
+        return {"new_unique_id": prefix + reg_entry.unique_id}
+
+    await er.async_migrate_entries(hass, entry.entry_id, migrate)
+
+
+def _service_target(hass: HomeAssistant, call: ServiceCall) -> VoltCoordinator:
+    """Koordynator wskazany przez `device_id` / `slave` (albo jedyny wpis)."""
+    coordinators: dict[str, VoltCoordinator] = hass.data.get(DOMAIN, {})
+    candidates = list(coordinators.values())
+    if (device_id := call.data.get("device_id")) is not None:
+        device = dr.async_get(hass).async_get(device_id)
+        entry_ids = device.config_entries if device is not None else set()
+        candidates = [coordinators[e] for e in entry_ids if e in coordinators]
+    if (slave := call.data.get("slave")) is not None:
+        candidates = [c for c in candidates if c.slave == slave]
+    if len(candidates) != 1:
+        raise ServiceValidationError(
+            f"write_register: {len(candidates)} inverters match – "
+            "pass device_id (or slave) of exactly one"
+        )
+    return candidates[0]
+
+
+async def _async_write_register(hass: HomeAssistant, call: ServiceCall) -> None:
+    coordinator = _service_target(hass, call)
+    addr = call.data["address"]
+    await coordinator.async_write_register(addr, call.data["value"])
+    # odczyt kontrolny zapisanego adresu i pozostałych nastaw przy
+    # najbliższym obudzeniu pętli
+    if (spec := coordinator.table.by_addr.get(("holding", addr))) is not None:
+        coordinator.async_refresh_keys([spec.key])
+    coordinator.async_invalidate_config()
+
+
+async def _async_options_updated(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
+async def _async_acquire_bus(hass: HomeAssistant, cfg, model_cfg) -> BusManager:
+    """Zwróć wspólny BusManager dla portu / bramki (utwórz i połącz, jeśli brak)."""
+    link = describe(cfg)
+    # HA zakłada wpisy równolegle – bez blokady dwa wpisy na tym samym porcie
+    # minęłyby się w trakcie connect() i otworzyły dwóch klientów
+    lock = hass.data.setdefault(DATA_BUS_LOCKS, {}).setdefault(link, asyncio.Lock())
+    async with lock:
+        return await _async_create_bus(hass, cfg, model_cfg, link)
+
+
+async def _async_create_bus(hass: HomeAssistant, cfg, model_cfg, link: str) -> BusManager:
+    buses: dict[str, BusManager] = hass.data.setdefault(DATA_BUSES, {})
+    if (bus := buses.get(link)) is not None:
+        return bus
+
+    # RS-485 lokalnie albo (pula połączeń) do bramki TCP
+    client = create_client(cfg)
+    serial = cfg.get("transport", TRANSPORT_SERIAL) == TRANSPORT_SERIAL
+
+    # szybki test połączenia
+    try:
+        async with async_timeout.timeout(3):
+            await client.connect()
+            if not client.connected:
+                raise ConfigEntryNotReady("Modbus port busy / not found")
+    except Exception as exc:
+        _LOGGER.debug("Modbus connect error: %s", exc)
+        client.close()
+        raise ConfigEntryNotReady("Modbus connection init failed") from exc
+
+    # cisza między ramkami: nadpisanie per model albo 3.5 znaku z baudrate;
+    # po TCP czasy na RS-485 pilnuje bramka. Ustala ją pierwszy wpis na porcie.
+    frame_gap = model_cfg.get("frame_gap") or (
+        rtu_frame_gap(cfg["baudrate"]) if serial else 0.0
+    )
+    bus = buses[link] = BusManager(hass, client, frame_gap, link)
+    return bus
+
+
+def _release_bus(hass: HomeAssistant, bus: BusManager, slave: int) -> None:
+    """Odłącz slave'a; ostatni konsument zamyka port."""
+    if bus.detach(slave):
+        hass.data[DATA_BUSES].pop(bus.link, None)
+        bus.close()
\ No newline at end of file
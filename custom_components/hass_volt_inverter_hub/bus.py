@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – magistrala Modbus: model czasowy + arbiter.
+
+• cisza między ramkami liczona z prędkości łącza (3.5 znaku, 11 bitów/znak)
+• powyżej 19200 bd stałe 1.75 ms – zgodnie ze specyfikacją Modbus RTU
+• przerwę wymuszamy tylko PRZED kolejną ramką, nigdy po ostatniej
+• zliczamy faktycznie „przestany” czas, żeby było widać zysk
+• BusManager – jeden klient na port, współdzielony przez wszystkie
+  inwertery (slave ID) na tej samej magistrali; transakcje z kolejek
+  poszczególnych slave'ów wykonywane na zmianę (round-robin)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, TypeVar
+
+from .const import DOMAIN
+
+_T = TypeVar("_T")
+
+DATA_BUSES = f"{DOMAIN}_buses"     # hass.data: link → BusManager
+DATA_BUS_LOCKS = f"{DOMAIN}_bus_locks"  # hass.data: link → asyncio.Lock (tworzenie)
+
+_BITS_PER_CHAR = 11            # start + 8 danych + parzystość/stop + stop
+_FAST_LINK_GAP = 0.00175       # s – dla > 19200 bd
+
+
+def rtu_frame_gap(baudrate: int) -> float:
+    """Minimalna cisza między ramkami Modbus RTU (s) dla danej prędkości."""
+    if baudrate > 19200:
+        return _FAST_LINK_GAP
+    return 3.5 * _BITS_PER_CHAR / baudrate
+
+
+class BusTiming:
+    """Pilnuje przerwy między kolejnymi ramkami i mierzy czas bezczynności."""
+
+    __slots__ = ("gap", "idle_time", "frames", "_last_end")
+
+    def __init__(self, gap: float) -> None:
+        self.gap = gap
+        self.idle_time = 0.0           # s – łącznie odczekane na ciszę
+        self.frames = 0
+        self._last_end: float | None = None
+
+    async def wait_turn(self) -> None:
+        """Odczekaj resztę przerwy od końca poprzedniej ramki (jeśli trzeba)."""
+        if self._last_end is None:
+            return
+        remaining = self._last_end + self.gap - time.monotonic()
+        if remaining > 0:
+            start = time.monotonic()
+            await asyncio.sleep(remaining)
+            self.idle_time += time.monotonic() - start
+
+    def frame_done(self) -> None:
+        """Zanotuj koniec ramki (odpowiedź odebrana albo błąd/timeout)."""
+        self._last_end = time.monotonic()
+        self.frames += 1
+
+
+class BusManager:
+    """Właściciel klienta Modbus dla jednego portu / bramki.
+
+    Każdy koordynator (slave) zleca transakcje przez `execute()`; kolejki
+    slave'ów obsługiwane są po kolei, więc jeden inwerter z długim cyklem
+    nie zagłodzi pozostałych, a ramki nigdy się nie przeplatają.
+    """
+
+    def __init__(self, hass, client: Any, frame_gap: float, link: str) -> None:
+        self.hass = hass
+        self.client = client
+        self.link = link
+        self.timing = BusTiming(frame_gap)
+        # >1 ⇒ pula połączeń TCP – tyle transakcji naraz
+        self.max_inflight = getattr(client, "max_inflight", 1)
+        self._slaves: dict[int, int] = {}           # slave → liczba konsumentów
+        self._queues: dict[int, deque] = {}
+        self._ready: deque[int] = deque()           # slave'y z pracą, w kolejności
+        self._kick = asyncio.Event()
+        self._workers: list[asyncio.Task] = []
+        self._closed = False
+
+    # ------------------------------------------------------------------
+    def attach(self, slave: int) -> None:
+        """Zarejestruj konsumenta (koordynator danego slave'a)."""
+        self._slaves[slave] = self._slaves.get(slave, 0) + 1
+
+    def detach(self, slave: int) -> bool:
+        """Wyrejestruj konsumenta; True ⇒ nikt już nie używa magistrali."""
+        left = self._slaves.get(slave, 0) - 1
+        if left > 0:
+            self._slaves[slave] = left
+        else:
+            self._slaves.pop(slave, None)
+        return not self._slaves
+
+    def close(self) -> None:
+        """Zatrzymaj obsługę kolejek i zamknij klienta (nieodwracalnie)."""
+        self._closed = True
+        for task in self._workers:
+            task.cancel()
+        self._workers.clear()
+        for queue in self._queues.values():
+            for _call, fut in queue:
+                if not fut.done():
+                    fut.cancel()
+        self._queues.clear()
+        self._ready.clear()
+        self.client.close()
+
+    # ------------------------------------------------------------------
+    async def execute(self, slave: int, call: Callable[[Any], Awaitable[_T]]) -> _T:
+        """Wykonaj `call(client)` jako jedną transakcję w kolejce slave'a."""
+        if self._closed:
+            # nie wskrzeszamy workerów na zamkniętym kliencie
+            raise ConnectionError(f"Modbus link {self.link} is closed")
+        fut: asyncio.Future = self.hass.loop.create_future()
+        queue = self._queues.setdefault(slave, deque())
+        if not queue:
+            self._ready.append(slave)
+        queue.append((call, fut))
+        self._kick.set()
+        if not self._workers:
+            self._workers = [
+                self.hass.async_create_background_task(
+                    self._worker(), f"{DOMAIN}_bus_{self.link}_{i}"
+                )
+                for i in range(self.max_inflight)
+            ]
+        return await fut
+
+    def _next_job(self) -> tuple[Callable, asyncio.Future] | None:
+        while self._ready:
+            slave = self._ready.popleft()
+            queue = self._queues[slave]
+            call, fut = queue.popleft()
+            if queue:
+                self._ready.append(slave)           # reszta – na koniec kolejki
+            if not fut.done():                      # zleceniodawca mógł zrezygnować
+                return call, fut
+        return None
+
+    def _fail_closed(self, fut: asyncio.Future) -> None:
+        # close() przerwał workera – zlecenie zdjęte już z kolejki, więc nikt
+        # inny go nie rozliczy; bez tego zleceniodawca czekałby w nieskończoność
+        if not fut.done():
+            fut.set_exception(ConnectionError(f"Modbus link {self.link} is closed"))
+
+    async def _worker(self) -> None:
+        while True:
+            job = self._next_job()
+            if job is None:
+                self._kick.clear()
+                await self._kick.wait()
+                continue
+            call, fut = job
+            try:
+                await self.timing.wait_turn()
+                try:
+                    result = await call(self.client)
+                finally:
+                    self.timing.frame_done()
+            except asyncio.CancelledError:
+                self._fail_closed(fut)
+                raise
+            except Exception as exc:                # noqa: BLE001
+                if not fut.done():
+                    fut.set_exception(exc)
+            else:
+                if not fut.done():
+                    fut.set_result(result)
@@ -3,20 +3,28 @@
 
 Krok 1
 ──────
-• model   – select (SUPPORTED_MODELS)
+• model     – select (models/*.yaml – nagłówki czytane w executorze)
+• transport – RS-485 / Modbus TCP / RTU over TCP
+• slave
+
+Krok 2a – serial
+────────────────
 • port    – lista wykrytych /dev/serial/by-id/* + <wpisz ręcznie…>
-• baudrate, slave
+  (skan portów w executorze, wynik pamiętany 30 s między krokami)
+• baudrate
+  (gdy wybrano „wpisz ręcznie…” → pole tekstowe z portem)
 
-Krok 2 (gdy wybrano „wpisz ręcznie…”)
-────────────────────────────────────
-• pole tekstowe z portem
+Krok 2b – TCP (bramka RS-485 ↔ Ethernet)
+────────────────────────────────────────
+• host, tcp_port
+• max_inflight – ile połączeń / transakcji jednocześnie (1 = szeregowo)
 
 Plik wymaga tylko PySerial (już jest w Core HA).
 """
 
 from __future__ import annotations
 
-import os, glob, pathlib
+import os, glob, pathlib, time
 import serial.tools.list_ports
 import voluptuous as vol
 from typing import Any
@@ -25,34 +33,61 @@ from homeassistant import config_entries
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
 
-from .const import DOMAIN, SUPPORTED_MODELS, DEFAULT_PORT, DEFAULT_BAUDRATE
+from .const import DOMAIN, DEFAULT_PORT, DEFAULT_BAUDRATE
+from .coordinator import DEFAULT_CONFIG_SWEEP
+from .model_loader import available_models
+from .transport import (
+    DEFAULT_MAX_INFLIGHT,
+    DEFAULT_TCP_PORT,
+    MAX_INFLIGHT,
+    TRANSPORT_SERIAL,
+    TRANSPORTS,
+    describe,
+)
 
 PORT_MANUAL = "__manual__"          # wewnętrzny identyfikator
+DATA_SERIAL_PORTS = f"{DOMAIN}_serial_ports"   # hass.data: (czas skanu, porty)
+PORTS_CACHE_TTL = 30                # s – ponowne wejście w krok nie skanuje od nowa
 
 
 # ────────────────────── HELPERS ────────────────────────────────────────
-def _friendly_path(device: str) -> str:
-    """Zwraca /dev/serial/by-id/… jeśli jest symlinkiem do `device`."""
-    for link in glob.glob("/dev/serial/by-id/*"):
+def _by_id_index() -> dict[str, str]:
+    """{urządzenie: /dev/serial/by-id/…} – jeden realpath na dowiązanie."""
+    index: dict[str, str] = {}
+    for link in sorted(glob.glob("/dev/serial/by-id/*")):
         try:
-            if os.path.realpath(link) == device:
-                return link
+            index.setdefault(os.path.realpath(link), link)
         except OSError:
             continue
-    return device
+    return index
+
+
+def _friendly_path(device: str, index: dict[str, str]) -> str:
+    """Zwraca /dev/serial/by-id/… jeśli jest symlinkiem do `device`."""
+    return index.get(device) or index.get(os.path.realpath(device), device)
 
 
 def _list_serial_ports() -> list[tuple[str, str]]:
-    """Lista (value, label) do formularza."""
+    """Lista (value, label) do formularza (blokujące – executor)."""
+    index = _by_id_index()
     entries = []
     for port in serial.tools.list_ports.comports():
-        pretty = _friendly_path(port.device)
+        pretty = _friendly_path(port.device, index)
         label = f"{pretty}  —  {port.description}"
         entries.append((pretty, label))
     # sortuj po ścieżce
     return sorted(entries, key=lambda x: x[0])
 
 
+async def _async_serial_ports(hass) -> list[tuple[str, str]]:
+    """Porty szeregowe – skan w executorze, wynik pamiętany PORTS_CACHE_TTL s."""
+    cached = hass.data.get(DATA_SERIAL_PORTS)
+    if cached is None or time.monotonic() - cached[0] > PORTS_CACHE_TTL:
+        ports = await hass.async_add_executor_job(_list_serial_ports)
+        cached = hass.data[DATA_SERIAL_PORTS] = (time.monotonic(), ports)
+    return list(cached[1])
+
+
 # ────────────────────── CONFIG FLOW ────────────────────────────────────
 class VoltConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
@@ -61,16 +96,15 @@ class VoltConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
-        ports = _list_serial_ports()
-        ports.append((PORT_MANUAL, "<wpisz ręcznie…>"))
-
+        if not hasattr(self, "_models"):
+            # {id: nazwa} – pliki models/*.yaml (odczyt dysku poza pętlą zdarzeń)
+            self._models = await self.hass.async_add_executor_job(available_models)
         schema = vol.Schema(
             {
-                vol.Required("model", default=next(iter(SUPPORTED_MODELS))):
-                    vol.In(SUPPORTED_MODELS),
-                vol.Required("port", default=DEFAULT_PORT):
-                    vol.In(dict(ports)),
-                vol.Required("baudrate", default=DEFAULT_BAUDRATE): int,
+                vol.Required("model", default=next(iter(self._models))):
+                    vol.In(self._models),
+                vol.Required("transport", default=TRANSPORT_SERIAL):
+                    vol.In(TRANSPORTS),
                 vol.Required("slave", default=4): int,
             }
         )
@@ -78,10 +112,50 @@ class VoltConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         if user_input is None:
             return self.async_show_form(step_id="user", data_schema=schema)
 
+        self._cache = user_input
+        if user_input["transport"] == TRANSPORT_SERIAL:
+            return await self.async_step_serial()
+        return await self.async_step_tcp()
+
+    # ────────── STEP 2a (serial) ──────────────────────────────────────
+    async def async_step_serial(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        if user_input is None:
+            ports = await _async_serial_ports(self.hass)
+            ports.append((PORT_MANUAL, "<wpisz ręcznie…>"))
+            schema = vol.Schema(
+                {
+                    vol.Required("port", default=DEFAULT_PORT):
+                        vol.In(dict(ports)),
+                    vol.Required("baudrate", default=DEFAULT_BAUDRATE): int,
+                }
+            )
+            return self.async_show_form(step_id="serial", data_schema=schema)
+
+        self._cache = {**self._cache, **user_input}
         if user_input["port"] == PORT_MANUAL:
-            self._cache = user_input
             return await self.async_step_port_manual()
-        return await self._create_entry(user_input)
+        return await self._create_entry(self._cache)
+
+    # ────────── STEP 2b (TCP gateway) ─────────────────────────────────
+    async def async_step_tcp(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        schema = vol.Schema(
+            {
+                vol.Required("host"): str,
+                vol.Required("tcp_port", default=DEFAULT_TCP_PORT):
+                    vol.All(vol.Coerce(int), vol.Range(min=1, max=65535)),
+                vol.Required("max_inflight", default=DEFAULT_MAX_INFLIGHT):
+                    vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_INFLIGHT)),
+            }
+        )
+
+        if user_input is None:
+            return self.async_show_form(step_id="tcp", data_schema=schema)
+
+        return await self._create_entry({**self._cache, **user_input})
 
     # ────────── STEP 2 (manual port) ──────────────────────────────────
     async def async_step_port_manual(
@@ -97,11 +171,10 @@ class VoltConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     # ────────── ENTRY HELPER ──────────────────────────────────────────
     async def _create_entry(self, data: dict[str, Any]) -> FlowResult:
-        await self.async_set_unique_id(
-            f"{data['model']}_{data['port']}_{data['slave']}"
-        )
+        link = describe(data)
+        await self.async_set_unique_id(f"{data['model']}_{link}_{data['slave']}")
         self._abort_if_unique_id_configured()
-        title = f"{SUPPORTED_MODELS[data['model']]}  ({data['port']})"
+        title = f"{self._models[data['model']]}  ({link})"
         return self.async_create_entry(title=title, data=data)
 
     # ────────── OPTIONS FLOW (prosty) ─────────────────────────────────
@@ -112,11 +185,16 @@ class VoltConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
 
 class OptionsFlowHandler(config_entries.OptionsFlow):
-    """Pozwala zmienić tylko globalny update_interval (sekundy)."""
+    """Globalny update_interval, przegląd nastaw (s), interwały adaptacyjne, nagrywanie."""
 
     def __init__(self, entry: config_entries.ConfigEntry) -> None:
         self.entry = entry
 
+    def _config_sweep(self) -> int:
+        """Bieżący przegląd nastaw (wg konfiguracji modelu), gdy wpis działa."""
+        coordinator = self.hass.data.get(DOMAIN, {}).get(self.entry.entry_id)
+        return int(getattr(coordinator, "config_sweep", DEFAULT_CONFIG_SWEEP))
+
     async def async_step_init(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -129,6 +207,18 @@ class OptionsFlowHandler(config_entries.OptionsFlow):
                     "update_interval",
                     default=self.entry.options.get("update_interval", 10),
                 ): vol.All(vol.Coerce(int), vol.Range(min=2, max=300)),
+                vol.Optional(
+                    "config_sweep",
+                    default=self.entry.options.get("config_sweep", self._config_sweep()),
+                ): vol.All(vol.Coerce(int), vol.Range(min=60, max=86400)),
+                vol.Optional(
+                    "adaptive_polling",
+                    default=self.entry.options.get("adaptive_polling", False),
+                ): bool,
+                vol.Optional(
+                    "record_traffic",
+                    default=self.entry.options.get("record_traffic", False),
+                ): bool,
             }
         )
         return self.async_show_form(step_id="init", data_schema=schema)
\ No newline at end of file
@@ -1,113 +1,939 @@
 #!/usr/bin/env python
-"""Volt Inverter Hub – coordinator (v6)
+"""Volt Inverter Hub – coordinator (v7)
 
-• każdy pojedynczy rejestr Modbus czytany osobno (z przerwą _SLEEP)
+• transakcje idą przez BusManager (bus.py) – jeden klient na port,
+  sprawiedliwy przydział między slave'y i wspólna cisza między ramkami
+• rejestry „do odczytu” łączone w bloki (planner.py) – jedna ramka na blok
+• cały blok dekodowany jednym `struct.unpack` (decode.py)
+• gdy blok się nie uda – awaryjnie czytamy jego rejestry pojedynczo
+• mapa rejestrów skompilowana raz przy starcie (register_map.py)
 • obsługa signed/unsigned, length = 1 lub 2
-• per-register „interval” (domyślnie 10 s)
-• czujniki złożone (`composite`) są liczone po zaktualizowaniu źródeł
+• per-register „interval” (domyślnie 10 s, może być ułamkowy)
+• harmonogram terminów (scheduler.py) – budzimy się tylko, gdy coś jest do odczytu
+• czujniki złożone (`composite`) – DAG z derived.py, liczone tylko gdy
+  zmieniło się któreś ze źródeł
+• zapisy z encji przez WriteQueue (writer.py) – debounce + FC16; stan
+  aktualizowany od razu (optymistycznie), potem odczyt kontrolny tylko
+  zapisanych adresów – urządzenie ma ostatnie słowo
+• budżet czasu magistrali na cykl – co się nie zmieści, idzie do następnego
+  cyklu; kolejność wg opóźnienia względem interwału (szybkie rejestry
+  pierwsze, odłożone nie głodzą się, bo ich opóźnienie rośnie)
+• interwały adaptacyjne (opcja wpisu / meta["adaptive"]) – rejestr, który
+  się rusza, czytany coraz częściej (do min), stojący coraz rzadziej (do max)
+• nastawy (RegisterSpec.config) czytane raz na starcie, po każdym zapisie
+  (kolejka encji i serwis write_register) i w rzadkim przeglądzie
+  `config_sweep` – zmiany z panelu inwertera
+• start etapami: najpierw mały zestaw krytyczny (model: `critical`) – musi
+  się udać, by wpis wstał; resztę doczytują zwykłe cykle w tle (w budżecie),
+  a encje czekają jako niedostępne; czasy do pierwszego / pełnego stanu
+  w `startup`
+• czytamy tylko rejestry z włączonymi encjami (+ źródła włączonych
+  composite, przechodnio) – zbiór śledzi rejestr encji na bieżąco
+• bezpiecznik per rejestr (health.py) – wiecznie błędne rejestry czytane
+  coraz rzadziej i osobno, zamiast co sekundę psuć cały blok; planer nie
+  doczytuje ich też jako wypełniacza dziury
+• milczenie całego urządzenia (≥ 2 bloki bez odpowiedzi albo jeden blok +
+  milczący rejestr, który dotąd odpowiadał) nie rusza bezpieczników
+• statystyki (stats.py): czasy transakcji per blok / rejestr, błędy,
+  czas cyklu, wykorzystanie magistrali – dla czujników diagnostycznych
+  i pobrania diagnostyki wpisu
+• opcjonalny rejestrator ruchu (recorder.py) – każda transakcja do logu
+  binarnego, zapis na dysk w executorze po cyklu
+• śledzenie etapów (tracing.py) – plan / I/O / dekodowanie / composite /
+  rozsyłanie / zapisy; wyłączone kosztuje jedno sprawdzenie flagi
+• powiadamiamy tylko encje kluczy, których wartość się zmieniła
+• filtr publikacji (publish.py) – `deadband` / `min_publish_interval` /
+  `max_publish_interval` z mapy; wstrzymana wartość nie trafia do encji
+  ani do czujników złożonych (te liczymy z wartości opublikowanych)
+• DeviceInfo budowane raz na grupę (tytuły grup z translations/<lang>.json
+  wczytane raz na język, w executorze) – encje dostają gotowy obiekt
 """
 
 from __future__ import annotations
 
 import asyncio
+import json
 import logging
+import os
 import time
-from datetime import timedelta
-from typing import Any
+from collections import deque
+from typing import Any, Collection
 
-from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.core import CALLBACK_TYPE, Event, callback
+from homeassistant.exceptions import ConfigEntryNotReady, HomeAssistantError
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import DeviceInfo
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+
+from .bus import BusManager
+from .const import DOMAIN
+from .decode import BlockDecoderCache
+from .derived import DerivedEngine
+from .health import (
+    ERR_CRC,
+    ERR_TIMEOUT,
+    HealthTracker,
+    ModbusResponseError,
+    classify_error,
+)
+from .planner import DEFAULT_MAX_GAP, ReadBlock, plan_reads
+from .publish import PublishFilter
+from .recorder import (
+    FC_READ_HOLDING,
+    FC_READ_INPUT,
+    FC_WRITE_MULTIPLE,
+    FC_WRITE_SINGLE,
+    TrafficRecorder,
+)
+from .register_map import RegisterSpec, RegisterTable
+from .scheduler import PollScheduler
+from .stats import PollStats
+from .tracing import Tracer
+from .writer import WriteQueue
 
 _LOGGER = logging.getLogger(__name__)
 
-_SLEEP = 0.03              # 30 ms ciszy pomiędzy ramkami
-DEFAULT_INTERVAL = 10      # gdy meta["interval"] nie podano
+_RETRY_DELAY = 1.0         # s – ponowna próba odczytu przerwanego wyjątkiem
+_DEAD_RETRY_MAX = 30.0     # s – max odstęp prób, gdy urządzenie w ogóle milczy
+_IDLE_WAIT = 60.0          # s – pusta kolejka (brak rejestrów z addr)
+
+DEFAULT_CYCLE_BUDGET = 1.0  # s – ile czasu magistrali może zająć jeden cykl
+DEFAULT_CONFIG_SWEEP = 600  # s – co ile ponownie czytamy nastawy (zmiany z panelu)
+
+DATA_GROUP_TITLES = f"{DOMAIN}_group_titles"   # hass.data: język → {grupa: tytuł}
+
+
+def _read_group_titles(lang: str) -> dict[str, str]:
+    """Wczytaj sekcję 'group' z translations/<lang>.json (blokujące – executor)."""
+    path = os.path.join(os.path.dirname(__file__), "translations", f"{lang}.json")
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get("group", {})
+    except (OSError, ValueError) as exc:
+        _LOGGER.debug("Nie udało się wczytać tłumaczeń grup (%s): %s", lang, exc)
+        return {}
 
 
 class VoltCoordinator(DataUpdateCoordinator[dict[str, Any]]):
     """Centralny punkt odpytywania inwertera Volt przez Modbus."""
 
-    def __init__(self, hass, client, slave: int, registers: dict[str, dict]):
-        self.client = client
+    def __init__(
+        self,
+        hass,
+        bus: BusManager,
+        slave: int,
+        table: RegisterTable,
+        derived: DerivedEngine,
+        max_gap: int = DEFAULT_MAX_GAP,
+        write_multiple: bool = True,
+        cycle_budget: float = DEFAULT_CYCLE_BUDGET,
+        tracer: Tracer | None = None,
+        config_sweep: float = DEFAULT_CONFIG_SWEEP,
+    ):
+        self.bus = bus
+        self.client = bus.client
         self.slave = slave
-        self.registers = registers
-        self._last_read = {k: 0.0 for k in registers}
+        # >1 ⇒ pula połączeń TCP – bloki czytamy równolegle
+        self.max_inflight = bus.max_inflight
+        self.cycle_budget = cycle_budget
+        # metryki: czasy transakcji, błędy, czas cyklu, odłożone odczyty…
+        self.stats = PollStats(self.max_inflight)
+        # śledzenie etapów – wspólne dla wszystkich wpisów (serwis start_trace)
+        self.tracer = tracer if tracer is not None else Tracer()
+        # opcjonalny zapis ruchu Modbus (opcje wpisu)
+        self.recorder: TrafficRecorder | None = None
+        # s – średni (EWMA) czas odczytu bloku; nie zaczynamy bloku, który
+        # by się już nie zmieścił w budżecie
+        self._block_time = 0.0
+        self.table = table
+        # surowe metadane (unit, options, …) – dla platform i encji
+        self.registers = table.meta
+        self._derived = derived
+        # klucze, których wartość zmieniła się w ostatnim cyklu
+        self.changed_keys: set[str] = set()
+        # klucze ustawione poza cyklem (zapis / odczyt kontrolny) od jego startu
+        self._written_since: set[str] = set()
+        # klucze z optymistyczną wartością – zapis w kolejce, przed odczytem kontrolnym
+        self._write_pending: set[str] = set()
+        # key → słuchacze (encje) tego klucza
+        self._key_listeners: dict[str, list[CALLBACK_TYPE]] = {}
+        self._notified_success = True
+        self.max_gap = max_gap
+        self._decoders = BlockDecoderCache()
+        # grupa → wspólne DeviceInfo (async_setup_devices)
+        self.devices: dict[str, DeviceInfo] = {}
+        self._object_suffix = ""
+        self.health = HealthTracker()
+        self.publish_filter = PublishFilter(table.polled)
+        # (fn, adres) – końce rejestrów, za którymi nie wolno „zasypywać” dziury
+        self._no_bridge: set[tuple[str, int]] = set()
+        self._dead_cycles = 0
+        # rejestry w harmonogramie – bez tych, których encje są wyłączone
+        self._active: set[str] = {spec.key for spec in table.polled}
+        # s od startu wpisu: pierwszy stan (zestaw krytyczny) i komplet danych
+        self.startup: dict[str, float | None] = {"first_state": None, "complete": None}
+        self._startup_at = 0.0
+        self._startup_pending: set[str] = set()
+        self.config_sweep = config_sweep
+        # nastawy – zmieniają się tylko przy zapisie; interwał = przegląd
+        self._config_keys = frozenset(spec.key for spec in table.config)
+        self._scheduler = PollScheduler(
+            {
+                spec.key: config_sweep if spec.config else spec.interval
+                for spec in table.polled
+            },
+            bounds={
+                spec.key: spec.adaptive[:2] for spec in table.polled if spec.adaptive
+            },
+        )
+        self._wake = asyncio.Event()
+        self._poll_task: asyncio.Task | None = None
+        self._stopping = False
+        self._writes = WriteQueue(
+            self._async_write_run, self._async_written, multi=write_multiple
+        )
 
         super().__init__(
             hass,
             _LOGGER,
             name="volt_inverter_hub",
-            # Tykamy co sekundę; i tak odpytywanie regulują per-rejestr interval-e
-            update_interval=timedelta(seconds=1),
+            # brak stałego ticku – odświeżenia wyzwala _async_poll_loop()
+            # dokładnie wtedy, gdy najbliższy rejestr jest „na czasie”
+            update_interval=None,
+            # bez zmian w danych nie ma czego rozsyłać
+            always_update=False,
+        )
+
+    # ------------------------------------------------------------------
+    @callback
+    def async_add_key_listener(
+        self, key: str, update_callback: CALLBACK_TYPE
+    ) -> CALLBACK_TYPE:
+        """Zapisz encję na zmiany jednego klucza; zwraca funkcję wypisującą."""
+        listeners = self._key_listeners.setdefault(key, [])
+        listeners.append(update_callback)
+
+        @callback
+        def remove_listener() -> None:
+            listeners.remove(update_callback)
+
+        return remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Powiadom słuchaczy – encje tylko wtedy, gdy zmienił się ich klucz."""
+        super().async_update_listeners()
+
+        if self.last_update_success != self._notified_success:
+            # dostępność zmienia się dla wszystkich encji naraz
+            self._notified_success = self.last_update_success
+            keys = self._key_listeners.keys()
+        else:
+            keys = self.changed_keys
+        with self.tracer.span("dispatch", pid=self.slave, keys=len(keys)):
+            for key in keys:
+                for update_callback in list(self._key_listeners.get(key, ())):
+                    update_callback()
+
+    # ------------------------------------------------------------------
+    async def async_setup_devices(
+        self, entry_id: str, model_name: str, default_slave: int | None = None
+    ) -> None:
+        """Zbuduj DeviceInfo każdej grupy rejestrów (raz, przed platformami).
+
+        `default_slave` – slave ID domyślny dla modelu; inwertery pod innym
+        adresem dostają sufiks „_<slave>” w entity_id i nazwach urządzeń.
+        """
+        self.entry_id = entry_id
+        self.model_name = model_name
+        self._object_suffix = (
+            f"_{self.slave}" if default_slave not in (None, self.slave) else ""
+        )
+
+        lang = self.hass.config.language
+        cache: dict[str, dict[str, str]] = self.hass.data.setdefault(
+            DATA_GROUP_TITLES, {}
+        )
+        if (titles := cache.get(lang)) is None:
+            titles = cache[lang] = await self.hass.async_add_executor_job(
+                _read_group_titles, lang
+            )
+
+        groups = (meta.get("group", "general") for meta in self.registers.values())
+        name_suffix = f" ({self.slave})" if self._object_suffix else ""
+        # "general" zawsze – trafiają tam czujniki diagnostyczne
+        for group in ("general", *groups):
+            if group in self.devices:
+                continue
+            # każde „urządzenie” (grupa) ma własne DeviceInfo
+            self.devices[group] = DeviceInfo(
+                identifiers={(DOMAIN, f"{entry_id}_{group}")},
+                # nazwa widoczna w UI = sama nazwa grupy (PL/EN z pliku translations)
+                name=titles.get(group, group.title()) + name_suffix,
+                manufacturer="Volt",
+                # pełna nazwa modelu w atrybucie 'model' (niewidoczna w nagłówku)
+                model=model_name,
+            )
+
+    def unique_id(self, key: str) -> str:
+        """unique_id encji klucza – w obrębie wpisu (kilka slave'ów na magistrali)."""
+        return f"{self.entry_id}_{key}"
+
+    def object_id(self, key: str) -> str:
+        """Podpowiedź object_id encji: sam klucz, inny slave niż domyślny – z sufiksem."""
+        return key + self._object_suffix
+
+    @callback
+    def async_track_entity_registry(self, entry) -> None:
+        """Pomijaj rejestry wyłączonych encji; reaguj na włączenie / wyłączenie."""
+        registry = er.async_get(self.hass)
+        prefix = self.unique_id("")
+        tracked: set[str] = set()               # entity_id encji tego wpisu
+
+        @callback
+        def apply() -> None:
+            entries = er.async_entries_for_config_entry(registry, entry.entry_id)
+            tracked.clear()
+            tracked.update(reg_entry.entity_id for reg_entry in entries)
+            self.async_set_disabled_keys(
+                {
+                    reg_entry.unique_id.removeprefix(prefix)
+                    for reg_entry in entries
+                    if reg_entry.disabled_by is not None
+                }
+            )
+
+        @callback
+        def is_ours(event: Event) -> bool:
+            # zdarzenie rejestru dotyczy wszystkich integracji – przeliczamy
+            # tylko dla encji tego wpisu, nie dla każdej zmiany w instancji
+            data = event.data
+            if data["action"] == "remove":
+                # wpisu już nie ma w rejestrze – rozpoznajemy po entity_id
+                return data["entity_id"] in tracked
+            if data["action"] == "update" and not (
+                "disabled_by" in data.get("changes", {})
+                or data.get("old_entity_id") in tracked
+            ):
+                return False
+            reg_entry = registry.async_get(data["entity_id"])
+            return reg_entry is not None and reg_entry.config_entry_id == entry.entry_id
+
+        @callback
+        def registry_updated(event: Event) -> None:
+            apply()
+
+        apply()
+        entry.async_on_unload(
+            self.hass.bus.async_listen(
+                er.EVENT_ENTITY_REGISTRY_UPDATED, registry_updated, event_filter=is_ours
+            )
+        )
+
+    def _sources_of(self, keys) -> set[str]:
+        """Źródła (także pośrednie) czujników złożonych spośród `keys`."""
+        by_key = self.table.by_key
+        needed: set[str] = set()
+        stack = list(keys)
+        while stack:
+            for src, _factor in by_key[stack.pop()].sources:
+                if src not in needed:
+                    needed.add(src)
+                    stack.append(src)
+        return needed
+
+    @callback
+    def async_set_disabled_keys(self, disabled: set[str]) -> None:
+        """Przelicz zbiór odpytywanych rejestrów przy danych wyłączonych kluczach.
+
+        Czytamy rejestry włączonych encji oraz źródła (także pośrednie)
+        włączonych czujników złożonych – nawet gdy własne encje źródeł są
+        wyłączone. Rejestr bez encji (`expose: false`) bez takiego odbiorcy
+        nie jest czytany wcale.
+        """
+        enabled = self.table.exposed - disabled
+        needed = self._sources_of(
+            spec.key for spec in self.table.composites if spec.key in enabled
+        )
+        active = {
+            spec.key
+            for spec in self.table.polled
+            if spec.key in enabled or spec.key in needed
+        }
+        removed = self._active - active
+        added = active - self._active
+        if not removed and not added:
+            return
+        self._active = active
+        for key in removed:
+            self._scheduler.discard(key)
+        if added:
+            self.async_refresh_keys(added)
+        _LOGGER.debug(
+            "Polling %d of %d registers (%d disabled entities)",
+            len(active), len(self.table.polled), len(disabled),
+        )
+
+    async def async_staged_first_refresh(
+        self, critical: Collection[str], started: float
+    ) -> None:
+        """Pierwszy odczyt: tylko `critical` (musi się udać), reszta w tle.
+
+        `started` – time.monotonic() ze startu wpisu (do raportu czasów).
+        Reszta rejestrów czeka na pętlę odpytywania (async_start_polling).
+        """
+        self._startup_at = started
+        by_key = self.table.by_key
+        wanted = {key for key in critical if key in by_key}
+        wanted |= self._sources_of(wanted)
+        first = wanted & self._active or set(self._active)
+        rest = self._active - first
+        for key in rest:
+            self._scheduler.discard(key)
+
+        await self.async_config_entry_first_refresh()
+        # bez zestawu krytycznego (czytamy wszystko) – jak dotąd, bez wymagań
+        if rest and (missing := sorted(k for k in first if self.data.get(k) is None)):
+            raise ConfigEntryNotReady(f"Cannot read {', '.join(missing)}")
+
+        self.startup["first_state"] = round(time.monotonic() - started, 3)
+        if rest:
+            self._startup_pending = rest
+            self.async_refresh_keys(rest)
+        else:
+            self.startup["complete"] = self.startup["first_state"]
+        _LOGGER.info(
+            "%s (slave %d): first state after %.2f s (%d registers), %d more in background",
+            self.model_name, self.slave, self.startup["first_state"], len(first), len(rest),
+        )
+
+    def async_start_polling(self, entry) -> None:
+        """Uruchom pętlę odpytywania jako zadanie w tle wpisu konfiguracji."""
+        self._poll_task = entry.async_create_background_task(
+            self.hass, self._async_poll_loop(), f"{self.name}_poll"
         )
 
+    async def async_shutdown(self) -> None:
+        """Zatrzymaj pętlę odpytywania i porzuć zapisy, także w locie (unload / stop HA).
+
+        Czekamy, aż oba zadania faktycznie się zakończą – dopiero potem
+        wolno zamknąć magistralę. Flaga + budzik kończą pętlę także wtedy,
+        gdy `wait_for` połknie anulowanie (wyścig z `async_wake`, Python 3.11).
+        """
+        self._stopping = True
+        self._wake.set()
+        tasks = [
+            task
+            for task in (self._poll_task, self._writes.cancel())
+            if task is not None
+        ]
+        self._poll_task = None
+        for task in tasks:
+            task.cancel()
+        if tasks:
+            await asyncio.wait(tasks)
+        await super().async_shutdown()
+
+    @callback
+    def async_wake(self) -> None:
+        """Przelicz termin najbliższego odczytu (np. po zmianie harmonogramu)."""
+        self._wake.set()
+
+    async def _async_poll_loop(self) -> None:
+        """Śpij do najbliższego terminu w kolejce, potem wykonaj cykl odczytu."""
+        # po async_shutdown() async_refresh() wraca od razu, bez odczytu –
+        # termin zostałby w przeszłości, a pętla kręciłaby się bez końca
+        while not self._stopping:
+            due = self._scheduler.next_due()
+            delay = _IDLE_WAIT if due is None else due - time.monotonic()
+            if delay > 0:
+                self._wake.clear()
+                try:
+                    await asyncio.wait_for(self._wake.wait(), delay)
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self.async_refresh()
+
     # ------------------------------------------------------------------
-    async def _read_single(self, key: str, meta: dict) -> float:
-        """Odczytaj jeden rejestr zgodnie z metadanymi i zwróć przeskalowaną wartość."""
-        length = meta.get("length", 1)
-        addr = meta["addr"]
-        fn = meta.get("input_type", "holding")
+    async def _transact(
+        self, fc: int, addr: int, count: int, call, values: list[int] | tuple[int, ...] = ()
+    ) -> Any:
+        """Transakcja przez arbitra magistrali (+ zapis do rejestratora)."""
+        with self.tracer.span("bus", "io", self.slave, fc=fc, addr=addr, count=count):
+            recorder = self.recorder
+            if recorder is None:
+                return await self.bus.execute(self.slave, call)
+            started = time.monotonic()
+            try:
+                rr = await self.bus.execute(self.slave, call)
+            except Exception:
+                recorder.record(self.slave, fc, addr, count, None, started)
+                raise
+            recorder.record(self.slave, fc, addr, count, rr, started, values)
+            return rr
 
+    async def _read_raw(self, fn: str, addr: int, count: int) -> list[int]:
+        """Jedna ramka FC03/FC04 → lista słów."""
+        slave = self.slave
         if fn == "input":
-            rr = await self.client.read_input_registers(addr, length, slave=self.slave)
+            rr = await self._transact(
+                FC_READ_INPUT, addr, count,
+                lambda c: c.read_input_registers(addr, count, slave=slave),
+            )
         else:
-            rr = await self.client.read_holding_registers(addr, length, slave=self.slave)
+            rr = await self._transact(
+                FC_READ_HOLDING, addr, count,
+                lambda c: c.read_holding_registers(addr, count, slave=slave),
+            )
+
+        if rr.isError():
+            raise ModbusResponseError(rr)
+        return rr.registers
+
+    async def async_write_register(self, addr: int, value: int) -> None:
+        """Zapis FC06 przez arbitra magistrali (nie przeplata się z odczytami)."""
+        slave = self.slave
+        rr = await self._transact(
+            FC_WRITE_SINGLE, addr, 1,
+            lambda c: c.write_register(addr, value, slave=slave), [value],
+        )
+        if rr.isError():
+            raise HomeAssistantError(f"Write {addr}={value} failed: {rr}")
 
+    async def async_queue_write(self, addr: int, value: int) -> None:
+        """Zapis z encji – przez kolejkę (debounce, łączenie w FC16)."""
+        spec = self.table.by_addr.get(("holding", addr))
+        if spec is not None and spec.length == 1:
+            # optymistycznie – encja pokazuje nową wartość od razu
+            with self.tracer.span("optimistic", "write", self.slave, addr=addr):
+                self._written_since.add(spec.key)
+                self._write_pending.add(spec.key)
+                self.async_publish({spec.key: spec.decode([value & 0xFFFF])})
+        with self.tracer.span("submit", "write", self.slave, addr=addr):
+            await self._writes.submit(addr, value)
+
+    async def _async_write_run(self, start: int, values: list[int]) -> None:
+        """Jedna seria z kolejki: FC06 dla pojedynczego adresu, FC16 dla kilku."""
+        if len(values) == 1:
+            await self.async_write_register(start, values[0])
+            return
+        slave = self.slave
+        rr = await self._transact(
+            FC_WRITE_MULTIPLE, start, len(values),
+            lambda c: c.write_registers(start, values, slave=slave), values,
+        )
         if rr.isError():
-            raise UpdateFailed(rr)
+            raise HomeAssistantError(f"Write {start}+{len(values)} failed: {rr}")
+
+    async def _async_written(self, written: dict[int, int], failed: list[int]) -> None:
+        """Po wysłaniu paczki – odczyt kontrolny TYLKO dotkniętych adresów.
+
+        Wartość z urządzenia zastępuje optymistyczną (również po nieudanym
+        zapisie); gdy odczyt się nie uda – klucz staje się niedostępny.
+        """
+        by_addr = self.table.by_addr
+        specs = {
+            by_addr[("holding", addr)]
+            for addr in (*written, *failed)
+            if ("holding", addr) in by_addr
+        }
+        fresh: dict[str, Any] = {}
+        now = time.monotonic()
+        try:
+            with self.tracer.span("read_back", "write", self.slave, registers=len(specs)):
+                for block in plan_reads(specs, max_gap=0):
+                    ok, _failed = await self._read_block(block, fresh)
+                    self._scheduler.reschedule(ok, now)
+        finally:
+            # urządzenie ma już ostatnie słowo – chyba że adres znów czeka w kolejce
+            self._write_pending.difference_update(
+                spec.key for spec in specs if not self._writes.is_pending(spec.addr)
+            )
+
+        for addr, value in written.items():
+            spec = by_addr.get(("holding", addr))
+            if spec is None or spec.length != 1 or fresh.get(spec.key) is None:
+                continue
+            if fresh[spec.key] != spec.decode([value & 0xFFFF]):
+                _LOGGER.warning(
+                    "%s: device kept %s after write of raw %s",
+                    spec.key, fresh[spec.key], value,
+                )
+        self._written_since.update(fresh)
+        self.async_publish(fresh)
+        # zapis jednej nastawy potrafi zmienić inne (np. typ baterii → napięcia)
+        self.async_invalidate_config(fresh)
+
+    @callback
+    def async_publish(self, values: dict[str, Any]) -> None:
+        """Wstaw wartości spoza cyklu odczytu i powiadom encje zmienionych kluczy."""
+        data = dict(self.data or {})
+        changed = {key for key, val in values.items() if data.get(key) != val}
+        if not changed:
+            return
+        self.publish_filter.touch(changed, time.monotonic())
+        data.update(values)
+        with self.tracer.span("composite", pid=self.slave):
+            self._derived.evaluate(data, changed)
+        self.changed_keys = changed
+        self.async_set_updated_data(data)
+
+    @property
+    def adaptive_intervals(self) -> dict[str, float]:
+        """Bieżące interwały rejestrów adaptacyjnych (s) – do strojenia widełek."""
+        active = self._active
+        return {
+            key: interval
+            for key, interval in self._scheduler.adaptive_intervals().items()
+            if key in active
+        }
+
+    @property
+    def polled_count(self) -> int:
+        """Ile rejestrów jest w harmonogramie (bez wyłączonych encji)."""
+        return len(self._active)
+
+    @property
+    def no_bridge(self) -> frozenset[tuple[str, int]]:
+        """(funkcja, adres) końców rejestrów, za którymi planer nie łączy bloków."""
+        return frozenset(self._no_bridge)
+
+    @property
+    def planned_reads_per_minute(self) -> float:
+        """Ile odczytów rejestrów na minutę wynika z bieżących interwałów."""
+        interval = self._scheduler.interval
+        return sum(60.0 / interval(key) for key in self._active)
+
+    @callback
+    def async_invalidate_config(self, fresh=()) -> None:
+        """Po zapisie – doczytaj pozostałe nastawy w najbliższym cyklu.
+
+        `fresh` – klucze właśnie odczytane kontrolnie (ich nie powtarzamy).
+        """
+        stale = self._config_keys.difference(fresh)
+        if stale:
+            self.async_refresh_keys(stale)
+
+    @callback
+    def async_refresh_keys(self, keys) -> None:
+        """Ustaw termin odczytu `keys` na „teraz” i obudź pętlę odpytywania."""
+        for key in keys:
+            self._scheduler.schedule(key, 0.0)
+        self.async_wake()
+
+    async def _read_single(self, spec: RegisterSpec) -> float:
+        """Odczytaj jeden rejestr i zwróć przeskalowaną wartość."""
+        return spec.decode(await self._read_raw(spec.fn, spec.addr, spec.length))
+
+    async def _read_block(
+        self, block: ReadBlock, data: dict[str, Any]
+    ) -> tuple[list[str], dict[str, str]]:
+        """Odczytaj cały blok jedną ramką i rozdziel wartości na klucze.
+
+        Zwraca (klucze odczytane poprawnie, {klucz: rodzaj błędu}).
+        """
+        stats = self.stats
+        label = f"{block.fn}:{block.start}+{block.count}"
+        started = time.monotonic()
+        try:
+            regs = await self._read_raw(block.fn, block.start, block.count)
+        except Exception as exc:                          # noqa: BLE001
+            kind = classify_error(exc)
+            stats.record_read(label, (), time.monotonic() - started, kind)
+            if kind in (ERR_TIMEOUT, ERR_CRC) or len(block.specs) == 1:
+                # urządzenie milczy – pojedyncze odczyty też by milczały
+                _LOGGER.debug(
+                    "Read %s %d+%d failed: %s", block.fn, block.start, block.count, exc
+                )
+                for spec in block.specs:
+                    data[spec.key] = None   # oznacz jako unavailable
+                return [], {spec.key: kind for spec in block.specs}
 
-        raw = rr.registers if length > 1 else rr.registers[0]
-        if length == 2:                                   # 32-bit (hi << 16 | lo)
-            raw = (raw[0] << 16) | raw[1]
+            _LOGGER.debug(
+                "Block %s %d+%d failed (%s) – fallback to single reads",
+                block.fn, block.start, block.count, exc,
+            )
+            ok: list[str] = []
+            failed: dict[str, str] = {}
+            for spec in block.specs:
+                single = f"{spec.fn}:{spec.addr}+{spec.length}"
+                started = time.monotonic()
+                try:
+                    data[spec.key] = await self._read_single(spec)
+                    ok.append(spec.key)
+                except Exception as exc2:                 # noqa: BLE001
+                    _LOGGER.debug("Read %s failed: %s", spec.key, exc2)
+                    data[spec.key] = None   # oznacz jako unavailable
+                    failed[spec.key] = classify_error(exc2)
+                    stats.record_read(
+                        single, (), time.monotonic() - started, failed[spec.key]
+                    )
+                else:
+                    stats.record_read(single, (spec.key,), time.monotonic() - started)
+            if not failed:
+                # winna była „zasypana” dziura – więcej jej nie doczytujemy
+                for prev, nxt in zip(block.specs, block.specs[1:]):
+                    if nxt.addr > prev.end:
+                        self._no_bridge.add((block.fn, prev.end))
+            return ok, failed
 
-        # domyślnie traktujemy jako signed ⇒ można nadpisać {"signed": False}
-        if meta.get("signed", True):
-            bitlen = 16 * length
-            sign_bit = 1 << (bitlen - 1)
-            mask = (1 << bitlen) - 1
-            if raw & sign_bit:
-                raw = -((~raw + 1) & mask)
+        keys = [spec.key for spec in block.specs]
+        stats.record_read(label, keys, time.monotonic() - started)
+        with self.tracer.span("decode", pid=self.slave, registers=len(keys)):
+            self._decoders.get(block).decode_into(regs, data)
+        return keys, {}
 
-        return raw * meta["scale"]
+    def _by_urgency(
+        self, blocks: list[ReadBlock], due: dict[str, float], now: float
+    ) -> list[ReadBlock]:
+        """Posortuj bloki: największe opóźnienie względem interwału najpierw.
+
+        Przy równym (np. zerowym) opóźnieniu – krótszy interwał pierwszy.
+        """
+        interval = self._scheduler.interval
+
+        def urgency(block: ReadBlock) -> tuple[float, float]:
+            late = max(
+                max(0.0, now - due[spec.key]) / interval(spec.key)
+                for spec in block.specs
+            )
+            return -late, min(interval(spec.key) for spec in block.specs)
+
+        return sorted(blocks, key=urgency)
+
+    def _adapt(self, ok_keys: list[str], fresh: dict[str, Any]) -> None:
+        """Dostosuj interwały kluczy adaptacyjnych do zmiany od poprzedniego odczytu."""
+        previous = self.data
+        if previous is None:
+            return
+        by_key = self.table.by_key
+        scheduler = self._scheduler
+        for key in ok_keys:
+            adaptive = by_key[key].adaptive
+            old = previous.get(key)
+            if adaptive is None or old is None or key in self._written_since:
+                continue
+            # tolerancja na błąd zaokrąglenia float przy wielokrotności skali
+            scheduler.adapt(key, abs(fresh[key] - old) > adaptive[2] + 1e-9)
+
+    async def _device_silent(
+        self,
+        results: list[tuple[list[str], dict[str, str]]],
+        fresh: dict[str, Any],
+    ) -> bool:
+        """Czy w tym cyklu milczało całe urządzenie, a nie pojedyncze rejestry?
+
+        Liczą się tylko bloki sprawnych rejestrów – próby kontrolne (half-open)
+        zawsze idą do bezpiecznika. Dwa milczące bloki i nic poza tym ⇒
+        urządzenie; jeden ⇒ rozstrzyga odczyt rejestru, który dotąd odpowiadał.
+        """
+        if any(ok for ok, _failed in results):
+            return False
+        failed = [f for _ok, f in results if f]
+        if not failed or any(
+            kind not in (ERR_TIMEOUT, ERR_CRC) for f in failed for kind in f.values()
+        ):
+            return False
+        is_healthy = self.health.is_healthy
+        healthy = [f for f in failed if all(is_healthy(key) for key in f)]
+        if len(healthy) != 1:
+            return len(healthy) > 1
+
+        data = self.data or {}
+        tried = {key for f in failed for key in f}
+        canary = next(
+            (
+                spec
+                for spec in self.table.polled
+                if spec.key in self._active
+                and spec.key not in tried
+                and is_healthy(spec.key)
+                and data.get(spec.key) is not None
+            ),
+            None,
+        )
+        if canary is None:
+            return False
+        block = ReadBlock(canary.fn, canary.addr, canary.length, [canary])
+        ok, canary_failed = await self._read_block(block, fresh)
+        results.append((ok, canary_failed))
+        return not ok
+
+    def _record_failure(self, key: str, kind: str, now: float) -> None:
+        """Błąd rejestru → bezpiecznik; otwarty nie jest „zasypywany” w blokach."""
+        was_healthy = self.health.is_healthy(key)
+        retry_at = self.health.record_failure(key, kind, now)
+        self._scheduler.schedule(key, retry_at)
+        if was_healthy and not self.health.is_healthy(key):
+            # planer nie doczyta go jako wypełniacza dziury – blok się dzieli
+            spec = self.table.by_key[key]
+            self._no_bridge.update((spec.fn, a) for a in range(spec.addr, spec.end))
+            _LOGGER.warning(
+                "%s: read failed (%s) – backing off for %.0f s",
+                key, kind, retry_at - now,
+            )
+
+    def _settle(
+        self,
+        due: dict[str, float],
+        results: list[tuple[list[str], dict[str, str]]],
+        deferred: list[ReadBlock],
+        now: float,
+        fresh: dict[str, Any],
+        silent: bool = False,
+    ) -> None:
+        """Zaplanuj kolejne odczyty wg wyników cyklu i stanu bezpieczników.
+
+        `silent` – milczało całe urządzenie (_device_silent).
+        """
+        ok_keys = [key for ok, _failed in results for key in ok]
+        failed = {key: kind for _ok, f in results for key, kind in f.items()}
+        scheduler = self._scheduler
+        health = self.health
+
+        if silent:
+            # odłączone / wyłączone urządzenie – to nie wina rejestrów,
+            # bezpieczników sprawnych nie ruszamy; próbujemy coraz rzadziej
+            self._dead_cycles += 1
+            delay = min(_RETRY_DELAY * 2 ** (self._dead_cycles - 1), _DEAD_RETRY_MAX)
+            for key, kind in failed.items():
+                if health.is_healthy(key):
+                    scheduler.schedule(key, now + delay)
+                else:
+                    self._record_failure(key, kind, now)
+        else:
+            if ok_keys:
+                self._dead_cycles = 0
+            for key in ok_keys:
+                if not health.is_healthy(key):
+                    # wrócił – znów może być czytany jako wypełniacz dziury
+                    spec = self.table.by_key[key]
+                    self._no_bridge.difference_update(
+                        (spec.fn, a) for a in range(spec.addr, spec.end)
+                    )
+                health.record_success(key)
+            self._adapt(ok_keys, fresh)
+            scheduler.reschedule(ok_keys, now)
+            for key, kind in failed.items():
+                self._record_failure(key, kind, now)
+
+        # nie zmieściło się w budżecie – zostaje z pierwotnym terminem
+        # (czyli „na czasie” już w następnym cyklu)
+        postponed = {spec.key for block in deferred for spec in block.specs}
+        for key in postponed:
+            scheduler.schedule(key, due[key])
+
+        # cykl przerwany wyjątkiem – reszta spróbuje niebawem
+        for key in set(due).difference(ok_keys, failed, postponed):
+            scheduler.schedule(key, now + _RETRY_DELAY)
 
     # ------------------------------------------------------------------
     async def _async_update_data(self) -> dict[str, Any]:
-        """Aktualizuj wszystkie rejestry zgodnie z ich indywidualnymi interwałami."""
+        """Odczytaj rejestry, których termin w harmonogramie właśnie minął."""
+        with self.tracer.span("cycle", pid=self.slave):
+            return await self._async_read_cycle()
+
+    async def _async_read_cycle(self) -> dict[str, Any]:
         now = time.monotonic()
-        # zaczynamy od poprzednich danych, żeby NIE gubić stanu unavailable → value
-        data: dict[str, Any] = {} if self.data is None else dict(self.data)
+        # zapisy jeszcze w oknie debounce – odczyt cyklu nie nadpisuje ich
+        # optymistycznej wartości, dopiero odczyt kontrolny po wysłaniu
+        self._written_since.clear()
+        self._written_since.update(self._write_pending)
+        fresh: dict[str, Any] = {}
 
-        for key, meta in self.registers.items():
-            # ------- 1. czujniki złożone / aliasy – nie mają addr -------
-            if "addr" not in meta:
-                if "composite" in meta:
-                    total = 0.0
-                    ready = True
-                    for src in meta["composite"]["sources"]:
-                        src_key = src["key"]
-                        factor = src.get("factor", 1.0)
-                        val = data.get(src_key)
-                        if val is None:
-                            ready = False
-                            break
-                        total += val * factor
-                    if ready:
-                        prec = meta.get("precision")
-                        data[key] = round(total, prec) if prec is not None else total
-                # jeśli to zwykły alias bez composite – zostawiamy starą wartość
-                continue
+        # ------- 1. zwykłe rejestry Modbus – zebrane w bloki ------------
+        # klucz wyłączony w trakcie poprzedniego cyklu mógł wrócić do kolejki
+        active = self._active
+        due = {
+            key: at for key, at in self._scheduler.pop_due(now).items() if key in active
+        }
+        idle_before = self.bus.timing.idle_time
+        results: list[tuple[list[str], dict[str, str]]] = []
+        queue: deque[ReadBlock] = deque()
+        silent = False
+        # pierwszy odczyt bez limitu – encje startują z kompletem danych
+        budget = self.cycle_budget if self.data is not None else float("inf")
+        try:
+            with self.tracer.span("plan", pid=self.slave, due=len(due)):
+                by_key = self.table.by_key
+                healthy: list[RegisterSpec] = []
+                isolated: list[ReadBlock] = []
+                for key in due:
+                    spec = by_key[key]
+                    if self.health.is_healthy(key):
+                        healthy.append(spec)
+                    else:
+                        # próba kontrolna – osobną ramką, nie psuje bloku sąsiadom
+                        self.health.mark_half_open(key)
+                        isolated.append(ReadBlock(spec.fn, spec.addr, spec.length, [spec]))
+                blocks = plan_reads(
+                    healthy, max_gap=self.max_gap, no_bridge=self._no_bridge
+                )
+                blocks.extend(isolated)
+                queue.extend(self._by_urgency(blocks, due, now))
+
+            async def worker() -> None:
+                # zawsze co najmniej jeden blok na cykl – postęp gwarantowany
+                while queue and (
+                    not results or time.monotonic() - now + self._block_time <= budget
+                ):
+                    block = queue.popleft()
+                    start = time.monotonic()
+                    results.append(await self._read_block(block, fresh))
+                    self._block_time += 0.2 * (time.monotonic() - start - self._block_time)
+
+            # >1 ⇒ pula połączeń TCP – bloki czytamy równolegle
+            await asyncio.gather(
+                *(worker() for _ in range(min(self.max_inflight, len(queue)) or 1))
+            )
+            silent = await self._device_silent(results, fresh)
+        finally:
+            self._settle(due, results, list(queue), now, fresh, silent)
+            elapsed = time.monotonic() - now
+            deferred = sum(len(block.specs) for block in queue)
+            self.stats.record_cycle(
+                elapsed,
+                deferred,
+                overrun=elapsed > budget,
+                idle=self.bus.timing.idle_time - idle_before,
+            )
+            if self.recorder is not None and self.recorder.pending:
+                self.hass.async_create_background_task(
+                    self.recorder.async_flush(self.hass), f"{self.name}_recorder"
+                )
+            if elapsed > budget:
+                _LOGGER.debug(
+                    "Cycle took %.3f s (budget %.3f s), %d reads deferred",
+                    elapsed, self.cycle_budget, deferred,
+                )
 
-            # ------- 2. zwykłe rejestry Modbus --------------------------
-            interval = meta.get("interval", DEFAULT_INTERVAL)
-            if now - self._last_read[key] < interval:
+        # zaczynamy od bieżących danych, żeby NIE gubić stanu unavailable → value;
+        # klucze zapisane w trakcie cyklu mają świeższy stan niż nasz odczyt
+        data: dict[str, Any] = {} if self.data is None else dict(self.data)
+        changed: set[str] = set()
+        publish = self.publish_filter
+        for key, val in fresh.items():
+            if key in self._written_since or (old := data.get(key)) == val:
+                continue
+            if key in publish and not publish.admit(key, old, val, now):
                 continue
+            data[key] = val
+            changed.add(key)
 
-            try:
-                data[key] = await self._read_single(key, meta)
-                self._last_read[key] = now
-            except Exception as exc:                      # noqa: BLE001
-                _LOGGER.debug("Read %s failed: %s", key, exc)
-                data[key] = None            # oznacz jako unavailable
+        # ------- 2. czujniki złożone – tylko gdy ruszyły się źródła ------
+        with self.tracer.span("composite", pid=self.slave, changed=len(changed)):
+            self._derived.evaluate(data, changed)
+        self.changed_keys = changed
 
-            await asyncio.sleep(_SLEEP)
+        if self._startup_pending:
+            # start etapami – po pierwszej próbie odczytu każdego rejestru
+            self._startup_pending.difference_update(fresh)
+            if not self._startup_pending:
+                self.startup["complete"] = round(time.monotonic() - self._startup_at, 3)
+                _LOGGER.info(
+                    "%s (slave %d): all registers read %.2f s after setup",
+                    self.model_name, self.slave, self.startup["complete"],
+                )
 
-        return data
\ No newline at end of file
+        return data
@@ -0,0 +1,73 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – dekodowanie całych bloków jednym przebiegiem.
+
+• dla każdego układu bloku budujemy raz `struct.Struct` (h/H/i/I + „x” na dziury)
+• słowa odpowiedzi → bajty → wszystkie wartości jednym `unpack_from`
+• kolejność słów 32-bit ("word_order": "little") – zamiana par przed pakowaniem
+• skala mnożona w tej samej pętli, która wpisuje wyniki do `data`
+"""
+
+from __future__ import annotations
+
+import struct
+from typing import Any, Iterable
+
+from .planner import ReadBlock
+from .register_map import RegisterSpec
+
+_CACHE_MAX = 64            # układów bloków – w praktyce kilka-kilkanaście
+
+
+class BlockDecoder:
+    """Skompilowany dekoder jednego układu bloku (start, count, rejestry)."""
+
+    __slots__ = ("keys", "_words", "_values", "_scales", "_swap")
+
+    def __init__(self, start: int, count: int, specs: Iterable[RegisterSpec]) -> None:
+        specs = sorted(specs, key=lambda spec: spec.addr)
+        fmt = [">"]
+        swap: list[int] = []
+        pos = start
+        for spec in specs:
+            if spec.addr > pos:
+                fmt.append(f"{2 * (spec.addr - pos)}x")     # dziura w adresacji
+            fmt.append(spec.fmt[1:])
+            if spec.word_swap:
+                swap.append(spec.addr - start)
+            pos = spec.end
+
+        self.keys = tuple(spec.key for spec in specs)
+        self._scales = tuple(spec.scale for spec in specs)
+        self._swap = tuple(swap)
+        self._words = struct.Struct(f">{count}H")
+        self._values = struct.Struct("".join(fmt))
+
+    def decode_into(self, regs: list[int], data: dict[str, Any]) -> None:
+        """Zdekoduj słowa bloku i wpisz przeskalowane wartości do `data`."""
+        if self._swap:
+            regs = list(regs)
+            for i in self._swap:
+                regs[i], regs[i + 1] = regs[i + 1], regs[i]
+        values = self._values.unpack_from(self._words.pack(*regs))
+        for key, val, scale in zip(self.keys, values, self._scales):
+            data[key] = val * scale
+
+
+class BlockDecoderCache:
+    """Dekodery per układ bloku – harmonogram powtarza te same układy co cykl."""
+
+    __slots__ = ("_decoders",)
+
+    def __init__(self) -> None:
+        self._decoders: dict[tuple, BlockDecoder] = {}
+
+    def get(self, block: ReadBlock) -> BlockDecoder:
+        """Zwróć (ew. zbuduj) dekoder dla danego bloku."""
+        sig = (block.fn, block.start, block.count, *(spec.key for spec in block.specs))
+        decoder = self._decoders.get(sig)
+        if decoder is None:
+            if len(self._decoders) >= _CACHE_MAX:
+                self._decoders.clear()
+            decoder = BlockDecoder(block.start, block.count, block.specs)
+            self._decoders[sig] = decoder
+        return decoder
@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – silnik czujników złożonych (`composite`).
+
+• wyrażenia kompilowane raz przy starcie do DAG-u w porządku topologicznym
+  (composite może korzystać z innego composite)
+• operacje: sum (domyślna), product, ratio, min, max, clamp
+• w cyklu liczymy tylko węzły, których źródła zmieniły się w tym cyklu
+
+Przykład w mapie rejestrów:
+
+    "volt_net_power": {
+        "composite": {
+            "op": "sum",
+            "sources": [{"key": "volt_power_load", "factor": 1},
+                        {"key": "volt_power_grid", "factor": -1}],
+        },
+    }
+
+`ratio` dzieli pierwsze (ważone) źródło przez sumę pozostałych, `clamp`
+obcina sumę źródeł do przedziału [`min`, `max`] z definicji composite.
+"""
+
+from __future__ import annotations
+
+import math
+from typing import Any, Callable
+
+from .register_map import RegisterMapError, RegisterSpec, RegisterTable
+
+
+def _op_sum(vals: list[float], _cfg: dict) -> float:
+    return math.fsum(vals)
+
+
+def _op_product(vals: list[float], _cfg: dict) -> float:
+    return math.prod(vals)
+
+
+def _op_ratio(vals: list[float], _cfg: dict) -> float | None:
+    den = math.fsum(vals[1:])
+    return None if den == 0 else vals[0] / den
+
+
+def _op_min(vals: list[float], _cfg: dict) -> float:
+    return min(vals)
+
+
+def _op_max(vals: list[float], _cfg: dict) -> float:
+    return max(vals)
+
+
+def _op_clamp(vals: list[float], cfg: dict) -> float:
+    total = math.fsum(vals)
+    if cfg.get("min") is not None:
+        total = max(total, cfg["min"])
+    if cfg.get("max") is not None:
+        total = min(total, cfg["max"])
+    return total
+
+
+OPERATIONS: dict[str, Callable[[list[float], dict], float | None]] = {
+    "sum": _op_sum,
+    "product": _op_product,
+    "ratio": _op_ratio,
+    "min": _op_min,
+    "max": _op_max,
+    "clamp": _op_clamp,
+}
+
+
+class _Node:
+    __slots__ = ("key", "sources", "op", "cfg", "precision")
+
+    def __init__(self, spec: RegisterSpec) -> None:
+        cfg = spec.meta["composite"]
+        op = cfg.get("op", "sum")
+        if op not in OPERATIONS:
+            raise RegisterMapError(f"{spec.key}: unknown composite op {op!r}")
+        if op == "ratio" and len(spec.sources) < 2:
+            raise RegisterMapError(f"{spec.key}: ratio needs at least 2 sources")
+        self.key = spec.key
+        self.sources = spec.sources
+        self.op = OPERATIONS[op]
+        self.cfg = cfg
+        self.precision = spec.precision
+
+
+class DerivedEngine:
+    """Posortowany topologicznie DAG czujników złożonych."""
+
+    __slots__ = ("_nodes",)
+
+    def __init__(self, table: RegisterTable) -> None:
+        nodes = {spec.key: _Node(spec) for spec in table.composites}
+
+        # sortowanie topologiczne (DFS) + wykrywanie cykli
+        order: list[_Node] = []
+        state: dict[str, int] = {}          # 1 = w trakcie, 2 = gotowy
+
+        def visit(key: str, path: tuple[str, ...]) -> None:
+            if state.get(key) == 2:
+                return
+            if state.get(key) == 1:
+                raise RegisterMapError(
+                    "composite cycle: " + " → ".join((*path, key))
+                )
+            state[key] = 1
+            for src_key, _factor in nodes[key].sources:
+                if src_key in nodes:
+                    visit(src_key, (*path, key))
+            state[key] = 2
+            order.append(nodes[key])
+
+        for key in nodes:
+            visit(key, ())
+        self._nodes = tuple(order)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def evaluate(
+        self, data: dict[str, Any], changed: set[str] | None = None
+    ) -> set[str]:
+        """Przelicz composite, których źródła są w `changed` (None = wszystkie).
+
+        Wyniki trafiają do `data`; zwracamy klucze, których wartość się zmieniła
+        (dopisywane też do `changed`, więc zależne composite widzą je od razu).
+        """
+        updated: set[str] = set()
+        for node in self._nodes:
+            if changed is not None and not any(
+                src_key in changed for src_key, _factor in node.sources
+            ):
+                continue
+            vals: list[float] = []
+            for src_key, factor in node.sources:
+                val = data.get(src_key)
+                if val is None:
+                    break
+                vals.append(val * factor)
+            else:
+                result = node.op(vals, node.cfg)
+                if result is None:
+                    continue
+                if node.precision is not None:
+                    result = round(result, node.precision)
+                if data.get(node.key) != result:
+                    data[node.key] = result
+                    updated.add(node.key)
+                    if changed is not None:
+                        changed.add(node.key)
+        return updated
@@ -0,0 +1,54 @@
+"""Diagnostyka wpisu (Ustawienia → Urządzenia → Pobierz diagnostykę)."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+from .coordinator import VoltCoordinator
+
+TO_REDACT = {"host"}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Metryki odpytywania, stan bezpieczników i parametry magistrali."""
+    coordinator: VoltCoordinator = hass.data[DOMAIN][entry.entry_id]
+    timing = coordinator.bus.timing
+    return {
+        "entry": async_redact_data(dict(entry.data), TO_REDACT),
+        "bus": {
+            "frame_gap_s": timing.gap,
+            "frames": timing.frames,
+            "idle_time_s": round(timing.idle_time, 3),
+            "max_inflight": coordinator.max_inflight,
+        },
+        "polling": {
+            "cycle_budget_s": coordinator.cycle_budget,
+            "max_gap": coordinator.max_gap,
+            "polled_registers": coordinator.polled_count,
+            "mapped_registers": len(coordinator.table.polled),
+            "config_registers": len(coordinator.table.config),
+            "config_sweep_s": coordinator.config_sweep,
+            "no_bridge": sorted(f"{fn}:{addr}" for fn, addr in coordinator.no_bridge),
+            # klucz → [bieżący, min, max] interwał (s) – tylko tryb adaptacyjny
+            "adaptive_intervals": {
+                key: [
+                    round(interval, 2),
+                    *coordinator.table.by_key[key].adaptive[:2],
+                ]
+                for key, interval in sorted(coordinator.adaptive_intervals.items())
+            },
+            **coordinator.stats.as_dict(),
+        },
+        # s od startu wpisu – pierwszy stan (zestaw krytyczny) / komplet danych
+        "startup": coordinator.startup,
+        # deadband / odstępy publikacji – ile odczytów nie trafiło do encji
+        "publish": coordinator.publish_filter.as_dict(),
+        "health": coordinator.health.snapshot(time.monotonic()),
+    }
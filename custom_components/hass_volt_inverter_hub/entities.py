@@ -2,16 +2,18 @@
 
 from __future__ import annotations
 import logging
-import os
-import json
-
-from homeassistant.components.sensor import SensorEntity
+from dataclasses import dataclass
+from typing import Any, Callable
+
+from homeassistant.components.sensor import (
+    SensorEntity,
+    SensorEntityDescription,
+    SensorStateClass,
+)
 from homeassistant.components.number import NumberEntity
 from homeassistant.components.switch import SwitchEntity
 from homeassistant.components.select import SelectEntity
-from homeassistant.helpers.entity import DeviceInfo
-
-from .const import DOMAIN
+from homeassistant.const import MATCH_ALL, PERCENTAGE, EntityCategory, UnitOfTime
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -19,17 +21,19 @@ _LOGGER = logging.getLogger(__name__)
 class VoltBase:
     """Mixin z koordynatorem, metadanymi i wspólnym DeviceInfo."""
 
+    # stan wypychany przez koordynator – tylko gdy zmienił się nasz klucz
+    _attr_should_poll = False
+
     def __init__(self, coordinator, key: str):
         self.coordinator = coordinator
         self._key = key
-        self._meta = coordinator.registers[key]
-        self._scale = self._meta.get("scale", 1)
-
-        # ✅ unikalny identyfikator encji
-        self._attr_unique_id = key
-        # 2) PODPOWIEDŹ dla entity_registry,
-        #    dzięki czemu entity_id przyjmie formę sensor.volt_battery_voltage
-        self._attr_suggested_object_id = key
+        # skompilowana specyfikacja (scale, precision, addr…) + surowe meta
+        self._spec = coordinator.table[key]
+        self._meta = self._spec.meta
+        self._scale = self._spec.scale
+
+        # ✅ unikalny identyfikator encji – w obrębie wpisu (slave'a)
+        self._attr_unique_id = coordinator.unique_id(key)
         # ✅ użyj wbudowanego mechanizmu tłumaczeń HA
         #    HA automatycznie zaczyta z translations/<lang>.json:
         #    entity.sensor.<key>.name etc.
@@ -40,46 +44,22 @@ class VoltBase:
         self._attr_device_class = self._meta.get("device_class")
 
         # ——— grupowanie na poziomie DeviceInfo —–
-        group = self._meta.get("group", "general")
-        title = self._load_group_title(group)
-
-        # self._attr_device_info = DeviceInfo(
-        #     identifiers={(DOMAIN, f"{coordinator.entry_id}_{group}")},
-        #     name=f"{coordinator.model_name} – {title}",
-        #     manufacturer="VOLT",
-        #     model=coordinator.model_name,
-        # )
-         # każde "urządzenie" (grupa) ma własne DeviceInfo
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, f"{coordinator.entry_id}_{group}")},
-            # nazwa widoczna w UI = sama nazwa grupy (PL/EN z pliku translations)
-            name=title, # wersja bez nazwy modelu
-            # name=f"{coordinator.model_name} – {title}", # wersja z nazwą modelu
-            manufacturer="Volt",
-            # pełna nazwa modelu można zostawić w atrybucie 'model' (niewidoczna w nagłówku)
-            model=coordinator.model_name
-        )
-
-
-    def _load_group_title(self, group: str) -> str:
-        """Wczytaj tytuł grupy z translations/<lang>.json → sekcja 'group'."""
-        lang = self.coordinator.hass.config.language
-        path = os.path.join(
-            os.path.dirname(__file__),
-            "translations",
-            f"{lang}.json",
+        # wspólny obiekt grupy, zbudowany raz w koordynatorze
+        self._attr_device_info = coordinator.devices[self._meta.get("group", "general")]
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_add_key_listener(
+                self._key, self.async_write_ha_state
+            )
         )
-        try:
-            with open(path, encoding="utf-8") as f:
-                data = json.load(f)
-            return data.get("group", {}).get(group, group.title())
-        except Exception as e:
-            _LOGGER.debug("Nie udało się wczytać tłumaczeń grupy %s: %s", group, e)
-            return group.title()
 
     @property
     def available(self) -> bool:
-        return self.coordinator.data is not None
+        # brak wartości (błąd odczytu, start etapami – jeszcze nie doczytano)
+        data = self.coordinator.data
+        return data is not None and data.get(self._key) is not None
 
 
 # ------------------------------------------------------------------
@@ -88,8 +68,8 @@ class VoltSensor(VoltBase, SensorEntity):
 
     def __init__(self, coordinator, key):
         super().__init__(coordinator, key)
-        # ↓ wymuszamy stały identyfikator
-        self.entity_id = f"sensor.{key}"
+        # ↓ podpowiedź entity_id dla rejestru encji: sensor.volt_battery_voltage
+        self.entity_id = f"sensor.{coordinator.object_id(key)}"
 
     @property
     def native_unit_of_measurement(self):
@@ -102,7 +82,7 @@ class VoltSensor(VoltBase, SensorEntity):
         val = self.coordinator.data.get(self._key)
         if val is None:
             return None
-        prec = self._meta.get("precision")
+        prec = self._spec.precision
         return round(val, prec) if prec is not None else val
 
 
@@ -112,12 +92,12 @@ class VoltNumber(VoltBase, NumberEntity):
 
     def __init__(self, coordinator, key):
         super().__init__(coordinator, key)
-        self.entity_id = f"number.{key}"
+        self.entity_id = f"number.{coordinator.object_id(key)}"
         self._attr_native_unit_of_measurement = self._meta.get("unit")
         self._attr_native_min_value = self._meta.get("min")
         self._attr_native_max_value = self._meta.get("max")
         self._attr_native_step = self._meta.get("step", 1)
-        self._addr = self._meta["addr"]
+        self._addr = self._spec.addr
 
     @property
     def native_value(self):
@@ -127,10 +107,7 @@ class VoltNumber(VoltBase, NumberEntity):
 
     async def async_set_native_value(self, value: float):
         raw = int(round(value / self._scale))
-        await self.coordinator.client.write_register(
-            self._addr, raw, slave=self.coordinator.slave
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_queue_write(self._addr, raw)
 
 
 # ------------------------------------------------------------------
@@ -139,8 +116,8 @@ class VoltSwitch(VoltBase, SwitchEntity):
 
     def __init__(self, coordinator, key: str):
         super().__init__(coordinator, key)
-        self.entity_id = f"switch.{key}"
-        self._addr = self._meta["addr"]
+        self.entity_id = f"switch.{coordinator.object_id(key)}"
+        self._addr = self._spec.addr
 
     @property
     def is_on(self):
@@ -149,16 +126,10 @@ class VoltSwitch(VoltBase, SwitchEntity):
         return self.coordinator.data.get(self._key) == 1
 
     async def async_turn_on(self, **kwargs):
-        await self.coordinator.client.write_register(
-            self._addr, 1, slave=self.coordinator.slave
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_queue_write(self._addr, 1)
 
     async def async_turn_off(self, **kwargs):
-        await self.coordinator.client.write_register(
-            self._addr, 0, slave=self.coordinator.slave
-        )
-        await self.coordinator.async_request_refresh()
+        await self.coordinator.async_queue_write(self._addr, 0)
 
 
 # ------------------------------------------------------------------
@@ -167,8 +138,8 @@ class VoltSelect(VoltBase, SelectEntity):
 
     def __init__(self, coordinator, key: str):
         super().__init__(coordinator, key)
-        self.entity_id = f"select.{key}"
-        self._addr = self._meta["addr"]
+        self.entity_id = f"select.{coordinator.object_id(key)}"
+        self._addr = self._spec.addr
         self._options_dict = self._meta["options"]
         self._attr_options = list(self._options_dict.values())
 
@@ -182,9 +153,105 @@ class VoltSelect(VoltBase, SelectEntity):
     async def async_select_option(self, option: str):
         for raw, label in self._options_dict.items():
             if label == option:
-                await self.coordinator.client.write_register(
-                    self._addr, raw, slave=self.coordinator.slave
-                )
-                await self.coordinator.async_request_refresh()
+                await self.coordinator.async_queue_write(self._addr, raw)
                 return
-        raise ValueError(f"Option {option} not found for {self._attr_name}")
\ No newline at end of file
+        raise ValueError(f"Option {option} not found for {self._attr_name}")
+
+
+# ------------------------------------------------------------------
+@dataclass(frozen=True, kw_only=True)
+class VoltDiagnosticDescription(SensorEntityDescription):
+    """Czujnik diagnostyczny – wartość liczona z koordynatora (stats / health)."""
+
+    value_fn: Callable[[Any], Any]
+    attrs_fn: Callable[[Any], dict[str, Any]] | None = None
+
+
+DIAGNOSTIC_SENSORS: tuple[VoltDiagnosticDescription, ...] = (
+    VoltDiagnosticDescription(
+        key="volt_diag_cycle_time",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: round(c.stats.last_cycle_time * 1000, 1),
+    ),
+    VoltDiagnosticDescription(
+        key="volt_diag_read_latency",
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: c.stats.read_latency_ms,
+    ),
+    VoltDiagnosticDescription(
+        key="volt_diag_bus_utilisation",
+        native_unit_of_measurement=PERCENTAGE,
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: c.stats.bus_utilisation,
+    ),
+    VoltDiagnosticDescription(
+        key="volt_diag_read_errors",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.stats.errors_total,
+    ),
+    VoltDiagnosticDescription(
+        key="volt_diag_deferred_reads",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.stats.deferred_total,
+    ),
+    VoltDiagnosticDescription(
+        key="volt_diag_cycle_overruns",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.stats.cycle_overruns,
+    ),
+    VoltDiagnosticDescription(
+        # planowane odczyty rejestrów / min; atrybuty – interwały adaptacyjne
+        key="volt_diag_poll_rate",
+        native_unit_of_measurement="reads/min",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: round(c.planned_reads_per_minute, 1),
+        attrs_fn=lambda c: {
+            key: round(interval, 1) for key, interval in c.adaptive_intervals.items()
+        },
+    ),
+    VoltDiagnosticDescription(
+        key="volt_diag_suppressed_registers",
+        state_class=SensorStateClass.MEASUREMENT,
+        value_fn=lambda c: len(c.health.suppressed),
+    ),
+    VoltDiagnosticDescription(
+        # odczyty wstrzymane przez deadband / min_publish_interval
+        key="volt_diag_filtered_updates",
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        value_fn=lambda c: c.publish_filter.suppressed,
+    ),
+)
+
+
+class VoltDiagnosticSensor(SensorEntity):
+    """Metryka odpytywania na urządzeniu „general” (domyślnie wyłączona)."""
+
+    entity_description: VoltDiagnosticDescription
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+    # atrybuty (np. interwały adaptacyjne) tylko do podglądu – nie do historii
+    _unrecorded_attributes = frozenset({MATCH_ALL})
+    # odczyt z pamięci (bez Modbus) – wystarczy zwykły scan_interval HA
+    _attr_should_poll = True
+
+    def __init__(self, coordinator, description: VoltDiagnosticDescription):
+        self.coordinator = coordinator
+        self.entity_description = description
+        key = description.key
+        self._attr_unique_id = coordinator.unique_id(key)
+        self._attr_translation_key = key
+        self.entity_id = f"sensor.{coordinator.object_id(key)}"
+        self._attr_device_info = coordinator.devices["general"]
+
+    @property
+    def native_value(self):
+        return self.entity_description.value_fn(self.coordinator)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        attrs_fn = self.entity_description.attrs_fn
+        return None if attrs_fn is None else attrs_fn(self.coordinator)
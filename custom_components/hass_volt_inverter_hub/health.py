@@ -0,0 +1,151 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – „bezpiecznik” (circuit breaker) per rejestr.
+
+• closed    – rejestr czytany normalnie (w blokach)
+• open      – po `threshold` kolejnych błędach: nie czytamy do `retry_at`,
+              odstęp rośnie wykładniczo (base · 2ⁿ, max `max_backoff`)
+• half_open – po upływie odstępu JEDNA próba (pojedynczym odczytem, żeby
+              nie psuć bloku sąsiadom); sukces → closed, błąd → open (dłużej)
+
+Błędy klasyfikujemy: timeout / illegal_address / crc / device / other.
+Nieobsługiwany adres (wyjątek Modbus 0x02) otwiera bezpiecznik od razu –
+to błąd deterministyczny, ponawianie co sekundę tylko zabiera czas magistrali.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass, field
+from typing import Any
+
+from pymodbus.exceptions import ModbusIOException
+
+ERR_TIMEOUT = "timeout"
+ERR_ILLEGAL_ADDRESS = "illegal_address"
+ERR_CRC = "crc"
+ERR_DEVICE = "device"
+ERR_OTHER = "other"
+
+STATE_CLOSED = "closed"
+STATE_OPEN = "open"
+STATE_HALF_OPEN = "half_open"
+
+DEFAULT_THRESHOLD = 3          # kolejne błędy do otwarcia
+DEFAULT_BASE_BACKOFF = 5.0     # s
+DEFAULT_MAX_BACKOFF = 900.0    # s
+_QUICK_RETRY = 1.0             # s – ponowienie, póki bezpiecznik zamknięty
+_ILLEGAL_ADDRESS = 0x02
+
+
+class ModbusResponseError(Exception):
+    """Urządzenie odpowiedziało ramką wyjątku Modbus."""
+
+    def __init__(self, response: Any) -> None:
+        super().__init__(str(response))
+        self.exception_code = getattr(response, "exception_code", None)
+
+
+def classify_error(exc: BaseException) -> str:
+    """Sklasyfikuj błąd odczytu."""
+    if isinstance(exc, ModbusResponseError):
+        if exc.exception_code == _ILLEGAL_ADDRESS:
+            return ERR_ILLEGAL_ADDRESS
+        return ERR_DEVICE
+    text = str(exc).lower()
+    if "crc" in text:
+        return ERR_CRC
+    if isinstance(exc, (asyncio.TimeoutError, TimeoutError, ModbusIOException)):
+        return ERR_TIMEOUT
+    if "no response" in text or "timeout" in text:
+        return ERR_TIMEOUT
+    return ERR_OTHER
+
+
+@dataclass(slots=True)
+class RegisterHealth:
+    """Stan bezpiecznika jednego rejestru."""
+
+    state: str = STATE_CLOSED
+    failures: int = 0                          # kolejne (od ostatniego sukcesu)
+    trips: int = 0                             # ile razy się otworzył
+    level: int = 0                             # wykładnik odstępu (zerowany po sukcesie)
+    retry_at: float = 0.0
+    last_error: str | None = None
+    errors: dict[str, int] = field(default_factory=dict)
+
+
+class HealthTracker:
+    """Bezpieczniki wszystkich rejestrów koordynatora."""
+
+    def __init__(
+        self,
+        threshold: int = DEFAULT_THRESHOLD,
+        base_backoff: float = DEFAULT_BASE_BACKOFF,
+        max_backoff: float = DEFAULT_MAX_BACKOFF,
+    ) -> None:
+        self.threshold = threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self._health: dict[str, RegisterHealth] = {}
+
+    def is_healthy(self, key: str) -> bool:
+        """True ⇒ rejestr może iść w bloku z innymi."""
+        health = self._health.get(key)
+        return health is None or health.state == STATE_CLOSED
+
+    def record_success(self, key: str) -> None:
+        health = self._health.get(key)
+        if health is not None:
+            health.state = STATE_CLOSED
+            health.failures = 0
+            health.level = 0
+
+    def record_failure(self, key: str, kind: str, now: float) -> float:
+        """Zapisz błąd; zwraca termin następnej próby."""
+        health = self._health.setdefault(key, RegisterHealth())
+        health.failures += 1
+        health.last_error = kind
+        health.errors[kind] = health.errors.get(kind, 0) + 1
+
+        if (
+            health.state == STATE_CLOSED
+            and health.failures < self.threshold
+            and kind != ERR_ILLEGAL_ADDRESS
+        ):
+            health.retry_at = now + _QUICK_RETRY
+            return health.retry_at
+
+        # otwarcie (albo ponowne po nieudanej próbie half-open)
+        health.trips += 1
+        health.level += 1
+        backoff = min(self.base_backoff * 2 ** (health.level - 1), self.max_backoff)
+        health.state = STATE_OPEN
+        health.retry_at = now + backoff
+        return health.retry_at
+
+    def mark_half_open(self, key: str) -> None:
+        """Termin minął – najbliższy odczyt to próba kontrolna."""
+        health = self._health.get(key)
+        if health is not None and health.state == STATE_OPEN:
+            health.state = STATE_HALF_OPEN
+
+    @property
+    def suppressed(self) -> list[str]:
+        """Klucze z otwartym bezpiecznikiem (nieczytane)."""
+        return [k for k, h in self._health.items() if h.state != STATE_CLOSED]
+
+    def snapshot(self, now: float) -> dict[str, dict[str, Any]]:
+        """Stan bezpieczników rejestrów, które kiedykolwiek zawiodły."""
+        return {
+            key: {
+                "state": h.state,
+                "failures": h.failures,
+                "trips": h.trips,
+                "last_error": h.last_error,
+                "errors": dict(h.errors),
+                "retry_in": max(0.0, round(h.retry_at - now, 1))
+                if h.state != STATE_CLOSED
+                else 0.0,
+            }
+            for key, h in self._health.items()
+        }
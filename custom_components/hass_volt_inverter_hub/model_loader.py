@@ -0,0 +1,182 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – mapy rejestrów modeli (pliki models/*.yaml).
+
+• jeden plik na model; `extends: <model>` dziedziczy mapę innego modelu,
+  a `registers` wariantu łata ją pole po polu (`null` usuwa pole, a cały
+  rejestr ustawiony na `null` – usuwa rejestr)
+• pliki zaczynające się od „_” to wspólne bazy – nie ma ich na liście modeli
+• wczytujemy tylko skonfigurowany model (i jego bazy), w executorze
+• skompilowana mapa (RegisterTable) trafia do cache na dysku – klucz to
+  skrót treści plików łańcucha + kodu kompilatora; kolejny start to jeden
+  `pickle.load` zamiast parsowania YAML-a i walidacji
+• lista modeli do formularza – tylko nagłówki plików (do `registers:`)
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import os
+import pickle
+from pathlib import Path
+from typing import Any
+
+import yaml
+
+from .const import DOMAIN
+from .register_map import RegisterMapError, RegisterTable, compile_registers
+
+MODELS_DIR = Path(__file__).parent / "models"
+CACHE_VERSION = 1                              # zmiana formatu cache ⇒ +1
+DATA_MODELS = f"{DOMAIN}_models"               # hass.data: (model, adaptive) → mapa
+
+_LOGGER = logging.getLogger(__name__)
+_LOADER = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+_COMPILER_SOURCE = Path(__file__).with_name("register_map.py")
+
+
+def _model_path(model_id: str) -> Path:
+    path = MODELS_DIR / f"{model_id}.yaml"
+    if not path.is_file():
+        raise RegisterMapError(f"unknown model {model_id!r}")
+    return path
+
+
+def _parse(model_id: str, text: str) -> dict[str, Any]:
+    try:
+        return yaml.load(text, Loader=_LOADER) or {}
+    except yaml.YAMLError as exc:
+        raise RegisterMapError(f"{model_id}: {exc}") from exc
+
+
+def _header(model_id: str, text: str) -> dict[str, Any]:
+    """Pola modelu przed `registers:` (nazwa, extends, …) bez parsowania mapy."""
+    head, _sep, _rest = text.partition("\nregisters:")
+    return _parse(model_id, head)
+
+
+def available_models() -> dict[str, str]:
+    """{id modelu: nazwa} – do wyboru w formularzu (blokujące – executor)."""
+    models: dict[str, str] = {}
+    for path in sorted(MODELS_DIR.glob("*.yaml")):
+        if path.name.startswith("_"):
+            continue
+        header = _header(path.stem, path.read_text(encoding="utf-8"))
+        models[path.stem] = header.get("name", path.stem)
+    return models
+
+
+def _chain(model_id: str) -> list[tuple[str, str]]:
+    """[(id, treść pliku)] – od bazy najgłębszej do samego modelu."""
+    chain: list[tuple[str, str]] = []
+    seen: set[str] = set()
+    current: str | None = model_id
+    while current is not None:
+        if current in seen:
+            raise RegisterMapError(f"{model_id}: 'extends' cycle through {current!r}")
+        seen.add(current)
+        text = _model_path(current).read_text(encoding="utf-8")
+        chain.append((current, text))
+        current = _header(current, text).get("extends")
+    chain.reverse()
+    return chain
+
+
+def _merge(base: dict[str, Any], patch: dict[str, Any]) -> dict[str, Any]:
+    """Nałóż wariant na bazę: pola modelu zastępujemy, rejestry łatamy."""
+    merged = {**base, **{k: v for k, v in patch.items() if k != "registers"}}
+    merged.pop("extends", None)
+    registers = dict(base.get("registers", {}))
+    for key, meta in (patch.get("registers") or {}).items():
+        if meta is None:
+            registers.pop(key, None)
+            continue
+        entry = {**registers.get(key, {}), **meta}
+        for field, value in meta.items():
+            if value is None:
+                entry.pop(field)
+        registers[key] = entry
+    merged["registers"] = registers
+    return merged
+
+
+def load_model(model_id: str) -> dict[str, Any]:
+    """Konfiguracja modelu po rozwinięciu `extends` (blokujące – executor)."""
+    return _build(_chain(model_id))
+
+
+def _build(chain: list[tuple[str, str]]) -> dict[str, Any]:
+    model: dict[str, Any] = {}
+    for model_id, text in chain:
+        model = _merge(model, _parse(model_id, text))
+    return model
+
+
+def load_compiled(
+    model_id: str, cache_dir: Path | None, adaptive: bool = False
+) -> tuple[dict[str, Any], RegisterTable]:
+    """(konfiguracja modelu, skompilowana mapa) – z cache, gdy treść się zgadza.
+
+    `adaptive` – opcja wpisu „interwały adaptacyjne” (zmienia kompilację).
+    Blokujące – executor.
+    """
+    chain = _chain(model_id)
+    digest = hashlib.sha256(f"{CACHE_VERSION}:{adaptive}".encode())
+    digest.update(_COMPILER_SOURCE.read_bytes())
+    for chain_id, text in chain:
+        digest.update(f"\0{chain_id}\0".encode())
+        digest.update(text.encode())
+    cache_file = None
+    if cache_dir is not None:
+        name = f"{model_id}.{int(adaptive)}.{digest.hexdigest()[:16]}.pickle"
+        cache_file = cache_dir / name
+        try:
+            with cache_file.open("rb") as f:
+                return pickle.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as exc:                      # noqa: BLE001 – uszkodzony cache
+            _LOGGER.debug("Ignoring model cache %s: %s", cache_file, exc)
+
+    model = _build(chain)
+    table = compile_registers(
+        model["registers"],
+        # opcja wpisu włącza tryb adaptacyjny z widełkami modelu (lub domyślnymi)
+        adaptive=model.get("adaptive", True) if adaptive else None,
+    )
+    model["registers"] = table.meta
+    if cache_file is not None:
+        _write_cache(cache_file, (model, table))
+    return model, table
+
+
+def _write_cache(cache_file: Path, payload: Any) -> None:
+    try:
+        cache_file.parent.mkdir(parents=True, exist_ok=True)
+        # poprzednie wersje tego modelu są już nieaktualne
+        prefix = cache_file.name.rsplit(".", 2)[0]         # <model>.<tryb>
+        for stale in cache_file.parent.glob(f"{prefix}.*.pickle"):
+            stale.unlink(missing_ok=True)
+        tmp = cache_file.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(payload, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, cache_file)
+    except OSError as exc:
+        _LOGGER.debug("Cannot write model cache %s: %s", cache_file, exc)
+
+
+async def async_get_model(
+    hass, model_id: str, adaptive: bool = False
+) -> tuple[dict[str, Any], RegisterTable]:
+    """Model dla wpisu – raz na (model, tryb) w procesie, wspólny dla wpisów."""
+    models: dict[tuple[str, bool], tuple[dict[str, Any], RegisterTable]] = (
+        hass.data.setdefault(DATA_MODELS, {})
+    )
+    if (loaded := models.get((model_id, adaptive))) is None:
+        loaded = models[(model_id, adaptive)] = await hass.async_add_executor_job(
+            load_compiled,
+            model_id,
+            Path(hass.config.path(".storage", f"{DOMAIN}_models")),
+            adaptive,
+        )
+    return loaded
@@ -7,15 +7,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .entities import VoltNumber
-
-
-ALLOWED_CLASSES = {
-    "voltage",
-    "current",
-    "power",
-    "energy",
-    "frequency",
-}
+from .register_map import entity_platforms
 
 
 async def async_setup_entry(
@@ -28,10 +20,6 @@ async def async_setup_entry(
     entities = [
         VoltNumber(coordinator, key)
         for key, meta in coordinator.registers.items()
-        if (
-            meta.get("is_write_reg")
-            and meta.get("device_class") in ALLOWED_CLASSES
-            and meta.get("expose", True)
-        )
+        if "number" in entity_platforms(meta)
     ]
     add_entities(entities, update_before_add=False)
\ No newline at end of file
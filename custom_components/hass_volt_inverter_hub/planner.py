@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – planer odczytów blokowych.
+
+• rejestry do odczytu grupowane są wg funkcji Modbus (`input_type`)
+• sąsiednie adresy łączone są w bloki ≤ 125 rejestrów (limit PDU)
+• małe dziury w adresacji są „zasypywane”, gdy to tańsze niż nowa ramka
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from typing import Collection, Iterable
+
+from .register_map import RegisterSpec
+
+MAX_REGISTERS_PER_READ = 125   # limit PDU dla FC03 / FC04
+DEFAULT_MAX_GAP = 8            # ile „pustych” rejestrów opłaca się doczytać
+
+
+@dataclass(slots=True)
+class ReadBlock:
+    """Jedna ramka odczytu: ciągły zakres adresów + rejestry, które go używają."""
+
+    fn: str                                   # "holding" | "input"
+    start: int
+    count: int
+    specs: list[RegisterSpec] = field(default_factory=list)
+
+    @property
+    def end(self) -> int:
+        """Pierwszy adres ZA blokiem."""
+        return self.start + self.count
+
+
+def plan_reads(
+    due: Iterable[RegisterSpec],
+    max_gap: int = DEFAULT_MAX_GAP,
+    max_count: int = MAX_REGISTERS_PER_READ,
+    no_bridge: Collection[tuple[str, int]] = frozenset(),
+) -> list[ReadBlock]:
+    """Zamień listę rejestrów na minimalną listę bloków do odczytu.
+
+    Dziura ≤ `max_gap` rejestrów jest doczytywana w ramach bloku – kilka
+    dodatkowych bajtów odpowiedzi kosztuje mniej niż kolejna ramka z ciszą
+    między ramkami i czasem reakcji inwertera. Wyjątek: dziury obejmujące
+    adres z `no_bridge` ((fn, adres)) – urządzenie odrzuca albo przemilcza
+    ich odczyt.
+    """
+    by_fn: dict[str, list[RegisterSpec]] = {}
+    for spec in due:
+        by_fn.setdefault(spec.fn, []).append(spec)
+
+    blocks: list[ReadBlock] = []
+    for fn, specs in by_fn.items():
+        specs.sort(key=lambda spec: spec.addr)
+        cur: ReadBlock | None = None
+        for spec in specs:
+            if (
+                cur is not None
+                and spec.addr - cur.end <= max_gap
+                and spec.end - cur.start <= max_count
+                and (
+                    spec.addr <= cur.end
+                    or not any((fn, a) in no_bridge for a in range(cur.end, spec.addr))
+                )
+            ):
+                cur.count = max(cur.count, spec.end - cur.start)
+                cur.specs.append(spec)
+                continue
+            cur = ReadBlock(fn, spec.addr, spec.length, [spec])
+            blocks.append(cur)
+    return blocks
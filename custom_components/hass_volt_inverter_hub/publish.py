@@ -0,0 +1,68 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – filtr publikacji stanu (deadband + odstępy).
+
+• `deadband` – zmiana o nie więcej niż próg (bezwzględny albo „2%” ostatnio
+  opublikowanej wartości) nie trafia do encji; porównujemy z wartością
+  OPUBLIKOWANĄ, więc powolny dryf w końcu przekroczy próg (histereza)
+• `min_publish_interval` – nie częściej niż co tyle sekund; zmiana czeka
+  na pierwszy odczyt po upływie odstępu
+• `max_publish_interval` – heartbeat: po tym czasie publikujemy bieżącą
+  wartość nawet w obrębie deadbandu (wykresy nie „zamierają”)
+• przejścia do / z niedostępności (None) zawsze od razu
+• liczymy wstrzymane aktualizacje – łącznie i per rejestr (diagnostyka)
+"""
+
+from __future__ import annotations
+
+from typing import Any, Iterable
+
+from .register_map import PublishRule, RegisterSpec
+
+
+class PublishFilter:
+    """Decyzja „publikować czy nie” dla rejestrów z regułą publikacji."""
+
+    def __init__(self, specs: Iterable[RegisterSpec]) -> None:
+        self._rules: dict[str, PublishRule] = {
+            spec.key: spec.publish for spec in specs if spec.publish is not None
+        }
+        self._last: dict[str, float] = {}      # klucz → czas ostatniej publikacji
+        self.suppressed = 0
+        self.suppressed_by_key: dict[str, int] = {}
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._rules
+
+    def __len__(self) -> int:
+        return len(self._rules)
+
+    def admit(self, key: str, old: Any, new: Any, now: float) -> bool:
+        """Czy opublikować `new` (poprzednio opublikowano `old`)?"""
+        rule = self._rules[key]
+        last = self._last.get(key)
+        if old is not None and new is not None and last is not None:
+            age = now - last
+            band = rule.deadband * abs(old) if rule.relative else rule.deadband
+            if age < rule.min_interval or (
+                abs(new - old) <= band and age < rule.max_interval
+            ):
+                self.suppressed += 1
+                self.suppressed_by_key[key] = self.suppressed_by_key.get(key, 0) + 1
+                return False
+        self._last[key] = now
+        return True
+
+    def touch(self, keys: Iterable[str], now: float) -> None:
+        """Wartości opublikowane poza filtrem (zapis z encji, odczyt kontrolny)."""
+        for key in keys:
+            if key in self._rules:
+                self._last[key] = now
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "registers": len(self._rules),
+            "suppressed": self.suppressed,
+            "suppressed_by_key": dict(
+                sorted(self.suppressed_by_key.items(), key=lambda kv: -kv[1])
+            ),
+        }
@@ -0,0 +1,262 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – rejestrator ruchu Modbus + klient do odtwarzania.
+
+• opcjonalny (opcje wpisu → „Nagrywaj ruch Modbus”) – każda transakcja
+  (żądanie + odpowiedź / błąd) jako jeden rekord binarny z czasem
+• plik tylko do dopisywania, rotacja po `max_bytes` (plik.1 … plik.N)
+• zapis na dysk w executorze, paczkami – w pętli zdarzeń tylko `bytearray`
+• ReplayClient – to samo API co klient pymodbus; odpowiada z obrazu
+  rejestrów odtwarzanego z logu (scripts/replay_traffic.py)
+
+Format pliku: nagłówek `VOLTREC1`, potem rekordy:
+
+    <d f B B B B H H H>  czas (unix), czas transakcji (s), slave, fc,
+                         status, kod wyjątku, adres, liczba rejestrów,
+                         liczba słów danych
+    <H × słowa>          odczytane rejestry (FC03/04) albo zapisane (FC06/16)
+"""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import struct
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Iterator
+
+from pymodbus.exceptions import ModbusIOException
+
+MAGIC = b"VOLTREC1"
+DEFAULT_MAX_BYTES = 8 * 1024 * 1024
+DEFAULT_BACKUPS = 3
+
+STATUS_OK = 0
+STATUS_EXCEPTION = 1           # ramka wyjątku Modbus (exception_code)
+STATUS_NO_RESPONSE = 2         # timeout / błąd transportu
+
+FC_READ_HOLDING = 3
+FC_READ_INPUT = 4
+FC_WRITE_SINGLE = 6
+FC_WRITE_MULTIPLE = 16
+
+_RECORD = struct.Struct("<dfBBBBHHH")
+
+
+@dataclass(slots=True, frozen=True)
+class TrafficRecord:
+    """Jedna transakcja z logu."""
+
+    ts: float
+    duration: float
+    slave: int
+    fc: int
+    status: int
+    exception_code: int
+    addr: int
+    count: int
+    words: tuple[int, ...]
+
+
+class TrafficRecorder:
+    """Bufor rekordów w pamięci + zapis/rotacja pliku (w executorze)."""
+
+    def __init__(
+        self,
+        path: str | os.PathLike,
+        max_bytes: int = DEFAULT_MAX_BYTES,
+        backups: int = DEFAULT_BACKUPS,
+    ) -> None:
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.records = 0
+        self._buffer = bytearray()
+        self._flush_lock = asyncio.Lock()
+
+    # ------------------------------------------------------------------
+    def record(
+        self,
+        slave: int,
+        fc: int,
+        addr: int,
+        count: int,
+        response: Any,
+        started: float,
+        values: list[int] | tuple[int, ...] = (),
+    ) -> None:
+        """Dopisz transakcję (`response` None ⇒ brak odpowiedzi).
+
+        `started` – time.monotonic() sprzed wysłania żądania.
+        """
+        duration = time.monotonic() - started
+        exc_code = 0
+        if response is None:
+            status, words = STATUS_NO_RESPONSE, ()
+        elif response.isError():
+            status, words = STATUS_EXCEPTION, ()
+            exc_code = getattr(response, "exception_code", 0) or 0
+        else:
+            status = STATUS_OK
+            words = values if values else getattr(response, "registers", ())
+        self._buffer += _RECORD.pack(
+            time.time() - duration, duration, slave, fc, status, exc_code,
+            addr, count, len(words),
+        )
+        if words:
+            self._buffer += struct.pack(f"<{len(words)}H", *words)
+        self.records += 1
+
+    @property
+    def pending(self) -> int:
+        """Bajty czekające na zapis."""
+        return len(self._buffer)
+
+    async def async_flush(self, hass) -> None:
+        """Zapisz bufor na dysk w executorze.
+
+        Zapisy idą po kolei: wywołanie w trakcie innego czeka na nie i dopisuje
+        to, co przybyło w międzyczasie – ostatnia paczka przy unloadzie nie
+        przepada.
+        """
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            data, self._buffer = bytes(self._buffer), bytearray()
+            await hass.async_add_executor_job(self._write, data)
+
+    def _write(self, data: bytes) -> None:
+        path = self.path
+        path.parent.mkdir(parents=True, exist_ok=True)
+        size = path.stat().st_size if path.exists() else 0
+        if size and size + len(data) > self.max_bytes:
+            self._rotate()
+            size = 0
+        with path.open("ab") as f:
+            if not size:
+                f.write(MAGIC)
+            f.write(data)
+
+    def _rotate(self) -> None:
+        path = self.path
+        oldest = path.with_name(f"{path.name}.{self.backups}")
+        if oldest.exists():
+            oldest.unlink()
+        for i in range(self.backups - 1, 0, -1):
+            src = path.with_name(f"{path.name}.{i}")
+            if src.exists():
+                src.rename(path.with_name(f"{path.name}.{i + 1}"))
+        if self.backups:
+            path.rename(path.with_name(f"{path.name}.1"))
+        else:
+            path.unlink()
+
+
+# ----------------------------------------------------------------------
+def read_log(path: str | os.PathLike) -> Iterator[TrafficRecord]:
+    """Rekordy z pliku i jego rotacji – od najstarszego."""
+    path = Path(path)
+    rotated = sorted(
+        (p for p in path.parent.glob(f"{path.name}.*") if p.suffix[1:].isdigit()),
+        key=lambda p: int(p.suffix[1:]),
+        reverse=True,
+    )
+    for part in (*rotated, path):
+        if not part.exists():
+            continue
+        data = part.read_bytes()
+        if not data.startswith(MAGIC):
+            raise ValueError(f"{part}: not a traffic log")
+        offset = len(MAGIC)
+        while offset + _RECORD.size <= len(data):
+            ts, duration, slave, fc, status, exc, addr, count, n = _RECORD.unpack_from(
+                data, offset
+            )
+            offset += _RECORD.size
+            if offset + 2 * n > len(data):
+                break                               # urwany ostatni rekord
+            words = struct.unpack_from(f"<{n}H", data, offset)
+            offset += 2 * n
+            yield TrafficRecord(ts, duration, slave, fc, status, exc, addr, count, words)
+
+
+class _ReplayResponse:
+    """Minimalna odpowiedź w stylu pymodbus."""
+
+    __slots__ = ("registers", "exception_code")
+
+    def __init__(self, registers: list[int], exception_code: int = 0) -> None:
+        self.registers = registers
+        self.exception_code = exception_code
+
+    def isError(self) -> bool:                      # noqa: N802 – API pymodbus
+        return bool(self.exception_code)
+
+    def __str__(self) -> str:
+        return f"Replayed exception response (code {self.exception_code})"
+
+
+class ReplayClient:
+    """Klient „Modbus” odtwarzający log: odpowiada z obrazu rejestrów.
+
+    `advance(ts)` nanosi na obraz wszystkie rekordy do chwili `ts`; błędy
+    z tego okna zostaną zwrócone raz – przy pierwszym pasującym żądaniu.
+    """
+
+    def __init__(self, records: list[TrafficRecord]) -> None:
+        self.records = records
+        self.connected = True
+        self.max_inflight = 1
+        self._pos = 0
+        self._image: dict[tuple[str, int], int] = {}
+        self._errors: dict[tuple[int, int, int, int], TrafficRecord] = {}
+
+    @staticmethod
+    def _space(fc: int) -> str:
+        return "i" if fc == FC_READ_INPUT else "h"
+
+    def advance(self, ts: float) -> None:
+        records = self.records
+        while self._pos < len(records) and records[self._pos].ts <= ts:
+            rec = records[self._pos]
+            self._pos += 1
+            if rec.status != STATUS_OK:
+                self._errors[(rec.slave, rec.fc, rec.addr, rec.count)] = rec
+                continue
+            space = self._space(rec.fc)
+            for i, word in enumerate(rec.words):
+                self._image[(space, rec.addr + i)] = word
+
+    async def connect(self) -> bool:
+        return True
+
+    def close(self) -> None:
+        self.connected = False
+
+    def _read(self, fc: int, address: int, count: int, slave: int) -> _ReplayResponse:
+        rec = self._errors.pop((slave, fc, address, count), None)
+        if rec is not None:
+            if rec.status == STATUS_NO_RESPONSE:
+                raise ModbusIOException("replayed: no response")
+            return _ReplayResponse([], rec.exception_code or 4)
+        space = self._space(fc)
+        image = self._image
+        return _ReplayResponse(
+            [image.get((space, a), 0) for a in range(address, address + count)]
+        )
+
+    async def read_holding_registers(self, address: int, count: int = 1, slave: int = 1):
+        return self._read(FC_READ_HOLDING, address, count, slave)
+
+    async def read_input_registers(self, address: int, count: int = 1, slave: int = 1):
+        return self._read(FC_READ_INPUT, address, count, slave)
+
+    async def write_register(self, address: int, value: int, slave: int = 1):
+        self._image[("h", address)] = value
+        return _ReplayResponse([])
+
+    async def write_registers(self, address: int, values: list[int], slave: int = 1):
+        for i, value in enumerate(values):
+            self._image[("h", address + i)] = value
+        return _ReplayResponse([])
@@ -0,0 +1,298 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – skompilowana mapa rejestrów.
+
+Jednorazowo (przy wczytaniu modelu) zamieniamy słownik `registers` z models/<model>.yaml
+na tablicę `RegisterSpec` (dataclass ze slotami):
+
+• indeks po kluczu i po (funkcja, adres)
+• gotowy format `struct` per rejestr + maski znaku + kolejność słów
+• rejestry konfiguracyjne (nastawy, `is_write_reg`) – czytane raz i po zapisie
+• widełki trybu adaptacyjnego (meta["adaptive"] albo domyślne modelu)
+• klucze z encją (`exposed`) – te same reguły co platformy, patrz
+  entity_platforms()
+• reguły publikacji: `deadband` (liczba lub „2%”), `min_publish_interval`,
+  `max_publish_interval` → PublishRule
+• walidacja: nakładające się adresy, brak `scale`, złe `length`,
+  nieistniejące źródła czujników złożonych → RegisterMapError
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Any
+
+DEFAULT_INTERVAL = 10      # gdy meta["interval"] nie podano
+DEFAULT_ADAPT_MAX = 6      # × interval – domyślny górny interwał trybu adaptacyjnego
+_FUNCTIONS = ("holding", "input")
+# device_class rejestrów zapisywalnych wystawianych jako encja number
+NUMBER_CLASSES = frozenset({"voltage", "current", "power", "energy", "frequency"})
+# (length, signed) → format struct (big-endian, słowo starsze pierwsze)
+_STRUCT_FMT = {
+    (1, True): ">h",
+    (1, False): ">H",
+    (2, True): ">i",
+    (2, False): ">I",
+}
+
+
+class RegisterMapError(ValueError):
+    """Błąd w definicji mapy rejestrów."""
+
+
+@dataclass(slots=True, frozen=True)
+class PublishRule:
+    """Kiedy nowa wartość rejestru trafia do encji (publish.py)."""
+
+    deadband: float                # bezwzględnie albo ułamek (relative)
+    relative: bool                 # deadband względem ostatnio opublikowanej
+    min_interval: float            # s – nie częściej niż
+    max_interval: float            # s – najpóźniej po tym czasie (heartbeat)
+
+
+@dataclass(slots=True, frozen=True, eq=False)
+class RegisterSpec:
+    """Skompilowany opis jednego klucza mapy (rejestr Modbus lub composite)."""
+
+    key: str
+    addr: int | None               # None ⇒ czujnik złożony / alias
+    length: int
+    fn: str                        # "holding" | "input"
+    signed: bool
+    word_swap: bool                # 32-bit: słowo młodsze pierwsze ("word_order": "little")
+    scale: float
+    precision: int | None
+    interval: float
+    # nastawa – czytana raz, po zapisie i w rzadkim przeglądzie (nie co `interval`)
+    config: bool
+    # (min interwał, max interwał, próg zmiany) – None ⇒ interwał stały
+    adaptive: tuple[float, float, float] | None
+    # deadband / min-max odstęp publikacji – None ⇒ każda zmiana od razu
+    publish: PublishRule | None
+    fmt: str                       # format struct dla słów rejestru
+    sign_bit: int                  # 1 << (16·length − 1)
+    wrap: int                      # 1 << (16·length) – odejmowane przy ujemnych
+    sources: tuple[tuple[str, float], ...]
+    meta: dict[str, Any]           # oryginalne metadane (unit, options, …)
+
+    @property
+    def end(self) -> int:
+        """Pierwszy adres ZA rejestrem."""
+        return self.addr + self.length
+
+    def decode(self, regs: list[int]) -> float:
+        """Zamień surowe słowa rejestru (1 lub 2) na przeskalowaną wartość."""
+        raw = regs[0]
+        if self.length == 2:                              # 32-bit (hi << 16 | lo)
+            raw = (regs[1] << 16) | raw if self.word_swap else (raw << 16) | regs[1]
+        if self.signed and raw & self.sign_bit:
+            raw -= self.wrap
+        return raw * self.scale
+
+
+class RegisterTable:
+    """Tablica specyfikacji z indeksami po kluczu i po adresie."""
+
+    __slots__ = (
+        "specs", "by_key", "by_addr", "polled", "config", "composites", "exposed", "meta"
+    )
+
+    def __init__(self, specs: list[RegisterSpec], meta: dict[str, dict]) -> None:
+        self.specs = tuple(specs)
+        self.meta = meta
+        self.by_key = {spec.key: spec for spec in specs}
+        self.polled = tuple(spec for spec in specs if spec.addr is not None)
+        self.config = tuple(spec for spec in self.polled if spec.config)
+        self.composites = tuple(spec for spec in specs if spec.sources)
+        # klucze, za którymi stoi encja – reszta (np. `expose: false`) to tylko źródła
+        self.exposed = frozenset(
+            spec.key for spec in specs if entity_platforms(spec.meta)
+        )
+        self.by_addr: dict[tuple[str, int], RegisterSpec] = {}
+        for spec in self.polled:
+            for addr in range(spec.addr, spec.end):
+                self.by_addr[(spec.fn, addr)] = spec
+
+    def __getitem__(self, key: str) -> RegisterSpec:
+        return self.by_key[key]
+
+    def __contains__(self, key: str) -> bool:
+        return key in self.by_key
+
+    def __len__(self) -> int:
+        return len(self.specs)
+
+
+def entity_platforms(meta: dict) -> set[str]:
+    """Platformy, na których klucz dostaje encję; pusty zbiór ⇒ bez encji.
+
+    • `expose: false` – nigdy
+    • sensor – każdy rejestr bez `is_write_reg` (także czujniki złożone)
+    • number – rejestr zapisywalny z device_class z NUMBER_CLASSES
+    • select / switch – wg meta["type"]
+    """
+    if not meta.get("expose", True):
+        return set()
+    platforms = set()
+    if not meta.get("is_write_reg"):
+        platforms.add("sensor")
+    elif meta.get("device_class") in NUMBER_CLASSES:
+        platforms.add("number")
+    if meta.get("type") in ("select", "switch"):
+        platforms.add(meta["type"])
+    return platforms
+
+
+def _is_config(meta: dict) -> bool:
+    """Nastawa: meta["config"], domyślnie każdy rejestr z `is_write_reg`."""
+    return meta.get("addr") is not None and bool(
+        meta.get("config", meta.get("is_write_reg", False))
+    )
+
+
+def _compile_adaptive(
+    key: str, meta: dict, model_default: dict | None
+) -> tuple[float, float, float] | None:
+    """Widełki trybu adaptacyjnego: meta["adaptive"] ma pierwszeństwo przed modelem.
+
+    Domyślnie min = interval (nigdy częściej niż skonfigurowano), max = 6 ×
+    interval, próg = jeden krok skali (szum ±1 jednostki to „stoi”).
+    Nastawy (`config`) nigdy – mają własny przegląd; model włącza tryb tylko
+    dla rejestrów do odczytu.
+    """
+    if meta.get("addr") is None or _is_config(meta):
+        return None
+    cfg = meta.get("adaptive")
+    if cfg is None:
+        if model_default is None or meta.get("is_write_reg"):
+            return None
+        cfg = model_default
+    if cfg is False:
+        return None
+    if cfg is True:
+        cfg = {}
+    interval = float(meta.get("interval", DEFAULT_INTERVAL))
+    hi = float(cfg.get("max", interval * DEFAULT_ADAPT_MAX))
+    lo = float(cfg.get("min", min(interval, hi)))
+    threshold = float(cfg.get("threshold", abs(meta.get("scale", 1))))
+    if not 0 < lo <= hi:
+        raise RegisterMapError(f"{key}: adaptive needs 0 < min <= max, got {lo}..{hi}")
+    if threshold < 0:
+        raise RegisterMapError(f"{key}: negative adaptive threshold {threshold}")
+    return lo, hi, threshold
+
+
+def _compile_publish(key: str, meta: dict) -> PublishRule | None:
+    """Reguła publikacji z meta – tylko rejestry Modbus, bez nastaw."""
+    deadband = meta.get("deadband")
+    min_interval = meta.get("min_publish_interval")
+    max_interval = meta.get("max_publish_interval")
+    if deadband is None and min_interval is None and max_interval is None:
+        return None
+    if meta.get("addr") is None or _is_config(meta):
+        raise RegisterMapError(f"{key}: deadband / publish intervals need a read-only register")
+
+    relative = isinstance(deadband, str)
+    try:
+        if relative:
+            if not deadband.endswith("%"):
+                raise ValueError
+            band = float(deadband[:-1]) / 100
+        else:
+            band = float(deadband or 0)
+    except ValueError:
+        raise RegisterMapError(f"{key}: bad deadband {deadband!r}") from None
+    lo = float(min_interval or 0)
+    hi = float("inf") if max_interval is None else float(max_interval)
+    if band < 0 or lo < 0 or hi <= 0 or lo > hi:
+        raise RegisterMapError(
+            f"{key}: need deadband >= 0 and 0 <= min_publish_interval <= max_publish_interval"
+        )
+    return PublishRule(band, relative, lo, hi)
+
+
+def _compile_one(key: str, meta: dict, adaptive: dict | None = None) -> RegisterSpec:
+    addr = meta.get("addr")
+    length = meta.get("length", 1)
+    signed = meta.get("signed", True)
+    composite = meta.get("composite")
+
+    if addr is not None:
+        if length not in (1, 2):
+            raise RegisterMapError(f"{key}: unsupported length {length}")
+        if "scale" not in meta:
+            raise RegisterMapError(f"{key}: missing 'scale'")
+        fn = meta.get("input_type", "holding")
+        if fn not in _FUNCTIONS:
+            raise RegisterMapError(f"{key}: unknown input_type {fn!r}")
+        if not 0 <= addr <= 0xFFFF - length + 1:
+            raise RegisterMapError(f"{key}: address {addr} out of range")
+        if meta.get("word_order", "big") not in ("big", "little"):
+            raise RegisterMapError(f"{key}: unknown word_order {meta['word_order']!r}")
+    else:
+        fn = meta.get("input_type", "holding")
+
+    sources: tuple[tuple[str, float], ...] = ()
+    if composite is not None:
+        sources = tuple(
+            (src["key"], float(src.get("factor", 1.0)))
+            for src in composite["sources"]
+        )
+        if not sources:
+            raise RegisterMapError(f"{key}: composite without sources")
+
+    bits = 16 * length
+    return RegisterSpec(
+        key=key,
+        addr=addr,
+        length=length,
+        fn=fn,
+        signed=signed,
+        word_swap=length == 2 and meta.get("word_order", "big") == "little",
+        scale=meta.get("scale", 1),
+        precision=meta.get("precision"),
+        interval=float(meta.get("interval", DEFAULT_INTERVAL)),
+        config=_is_config(meta),
+        adaptive=_compile_adaptive(key, meta, adaptive),
+        publish=_compile_publish(key, meta),
+        fmt=_STRUCT_FMT[(length, signed)] if addr is not None else "",
+        sign_bit=1 << (bits - 1),
+        wrap=1 << bits,
+        sources=sources,
+        meta=meta,
+    )
+
+
+def compile_registers(
+    registers: dict[str, dict], adaptive: bool | dict | None = None
+) -> RegisterTable:
+    """Zwaliduj i skompiluj słownik rejestrów – wywoływane raz przy starcie.
+
+    `adaptive` – domyślne widełki trybu adaptacyjnego z konfiguracji modelu
+    (True ⇒ wartości domyślne, dict ⇒ min / max / threshold).
+    """
+    if adaptive is True:
+        adaptive = {}
+    elif not adaptive:
+        adaptive = None
+    specs = [_compile_one(key, meta, adaptive) for key, meta in registers.items()]
+
+    # nakładające się zakresy adresów (w obrębie jednej funkcji Modbus)
+    for fn in _FUNCTIONS:
+        ranges = sorted(
+            (spec for spec in specs if spec.addr is not None and spec.fn == fn),
+            key=lambda spec: spec.addr,
+        )
+        for prev, cur in zip(ranges, ranges[1:]):
+            if cur.addr < prev.end:
+                raise RegisterMapError(
+                    f"{cur.key}: address {cur.addr} overlaps {prev.key} "
+                    f"({prev.addr}..{prev.end - 1})"
+                )
+
+    keys = {spec.key for spec in specs}
+    for spec in specs:
+        for src_key, _factor in spec.sources:
+            if src_key not in keys:
+                raise RegisterMapError(f"{spec.key}: unknown source {src_key!r}")
+
+    return RegisterTable(specs, registers)
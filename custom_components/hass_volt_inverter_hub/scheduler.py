@@ -0,0 +1,105 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – harmonogram odpytywania (kolejka terminów).
+
+• kopiec (heapq) z terminem następnego odczytu każdego rejestru
+• budzimy się tylko, gdy najwcześniejszy rejestr jest „na czasie”
+• wszystko, co przypada w oknie `window`, czytamy w jednym cyklu
+• interwały mogą być ułamkowe (np. 0.5 s)
+• tryb adaptacyjny: interwał klucza z widełkami (min, max) maleje o połowę,
+  gdy wartość się rusza, i rośnie o 25 %, gdy stoi – szybko łapie zmiany,
+  powoli odpuszcza
+"""
+
+from __future__ import annotations
+
+import heapq
+from typing import Iterable
+
+DEFAULT_BATCH_WINDOW = 0.25    # s – rejestry „prawie na czasie” dołączamy do cyklu
+MIN_INTERVAL = 0.1             # s – dolna granica meta["interval"]
+ADAPT_SHRINK = 0.5             # × interwał, gdy wartość się zmieniła
+ADAPT_GROW = 1.25              # × interwał, gdy wartość stoi
+
+
+class PollScheduler:
+    """Kolejka priorytetowa terminów odczytu z leniwym usuwaniem wpisów."""
+
+    def __init__(
+        self,
+        intervals: dict[str, float],
+        window: float = DEFAULT_BATCH_WINDOW,
+        bounds: dict[str, tuple[float, float]] | None = None,
+    ) -> None:
+        self.window = window
+        self._interval = {k: max(float(v), MIN_INTERVAL) for k, v in intervals.items()}
+        # klucze adaptacyjne → (min, max) interwału
+        self._bounds = {
+            k: (max(lo, MIN_INTERVAL), max(hi, MIN_INTERVAL))
+            for k, (lo, hi) in (bounds or {}).items()
+        }
+        self._due_at: dict[str, float] = {}
+        self._heap: list[tuple[float, str]] = []
+        for key in self._interval:
+            self.schedule(key, 0.0)
+
+    # ------------------------------------------------------------------
+    def interval(self, key: str) -> float:
+        """Interwał odczytu danego rejestru (s)."""
+        return self._interval[key]
+
+    def adapt(self, key: str, moved: bool) -> None:
+        """Skróć (wartość się ruszyła) lub wydłuż interwał klucza adaptacyjnego."""
+        bounds = self._bounds.get(key)
+        if bounds is None:
+            return
+        lo, hi = bounds
+        current = self._interval[key]
+        if moved:
+            self._interval[key] = max(lo, current * ADAPT_SHRINK)
+        else:
+            self._interval[key] = min(hi, current * ADAPT_GROW)
+
+    def adaptive_intervals(self) -> dict[str, float]:
+        """Bieżące interwały kluczy adaptacyjnych (diagnostyka / strojenie)."""
+        return {key: self._interval[key] for key in self._bounds}
+
+    def schedule(self, key: str, due: float) -> None:
+        """Ustaw termin odczytu `key` (poprzedni wpis w kopcu staje się nieaktualny)."""
+        self._due_at[key] = due
+        heapq.heappush(self._heap, (due, key))
+
+    def discard(self, key: str) -> None:
+        """Wyjmij `key` z kolejki (wpis w kopcu staje się nieaktualny)."""
+        self._due_at.pop(key, None)
+
+    def reschedule(self, keys: Iterable[str], now: float) -> None:
+        """Zaplanuj kolejny odczyt `keys` za ich własny interwał."""
+        for key in keys:
+            self.schedule(key, now + self._interval[key])
+
+    def next_due(self) -> float | None:
+        """Najwcześniejszy termin w kolejce (None, gdy pusta)."""
+        heap = self._heap
+        while heap:
+            due, key = heap[0]
+            if self._due_at.get(key) == due:
+                return due
+            heapq.heappop(heap)                 # wpis nieaktualny
+        return None
+
+    def pop_due(self, now: float) -> dict[str, float]:
+        """Zdejmij z kolejki wszystkie rejestry z terminem ≤ now + window.
+
+        Zwraca {klucz: termin} – odłożony odczyt wraca z pierwotnym terminem,
+        więc jego opóźnienie rośnie i z każdym cyklem ma wyższy priorytet.
+        """
+        limit = now + self.window
+        heap = self._heap
+        keys: dict[str, float] = {}
+        while heap and heap[0][0] <= limit:
+            due, key = heapq.heappop(heap)
+            if self._due_at.get(key) != due:
+                continue                        # wpis nieaktualny
+            del self._due_at[key]
+            keys[key] = due
+        return keys
@@ -6,7 +6,8 @@ from homeassistant.config_entries import ConfigEntry
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
-from .entities import VoltSensor
+from .entities import DIAGNOSTIC_SENSORS, VoltDiagnosticSensor, VoltSensor
+from .register_map import entity_platforms
 
 
 async def async_setup_entry(
@@ -19,7 +20,12 @@ async def async_setup_entry(
     entities = [
         VoltSensor(coordinator, key)
         for key, meta in coordinator.registers.items()
-        # brak zapisu, a jednocześnie „expose” nie jest False
-        if not meta.get("is_write_reg") and meta.get("expose", True)
+        # tylko do odczytu (także złożone), a „expose” nie jest False
+        if "sensor" in entity_platforms(meta)
     ]
+    # metryki odpytywania – włączane ręcznie w rejestrze encji
+    entities.extend(
+        VoltDiagnosticSensor(coordinator, description)
+        for description in DIAGNOSTIC_SENSORS
+    )
     add_entities(entities, update_before_add=False)
\ No newline at end of file
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – statystyki odpytywania (diagnostyka wydajności).
+
+• histogramy czasu transakcji (round-trip, łącznie z kolejką magistrali)
+  per blok i per rejestr – tylko odczyty udane, błędy liczone osobno
+• liczniki błędów wg rodzaju (health.py: timeout / illegal_address / …)
+• czas cyklu, przekroczenia budżetu, odłożone odczyty
+• wykorzystanie magistrali: czas transakcji tego slave'a / czas od
+  poprzedniego cyklu (przy puli TCP – na jedno połączenie)
+"""
+
+from __future__ import annotations
+
+import bisect
+import time
+from typing import Any, Iterable
+
+LATENCY_BUCKETS_MS = (5, 10, 20, 50, 100, 200, 500, 1000, 2000)
+
+
+class LatencyHistogram:
+    """Histogram czasów (kubełki w ms) + liczność, średnia i maksimum."""
+
+    __slots__ = ("counts", "count", "total", "max")
+
+    def __init__(self) -> None:
+        self.counts = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+        self.count = 0
+        self.total = 0.0               # s
+        self.max = 0.0                 # s
+
+    def record(self, seconds: float) -> None:
+        self.counts[bisect.bisect_left(LATENCY_BUCKETS_MS, seconds * 1000)] += 1
+        self.count += 1
+        self.total += seconds
+        if seconds > self.max:
+            self.max = seconds
+
+    @property
+    def mean_ms(self) -> float | None:
+        return round(self.total / self.count * 1000, 2) if self.count else None
+
+    def as_dict(self) -> dict[str, Any]:
+        labels = [f"<={b}" for b in LATENCY_BUCKETS_MS] + [f">{LATENCY_BUCKETS_MS[-1]}"]
+        return {
+            "count": self.count,
+            "mean_ms": self.mean_ms,
+            "max_ms": round(self.max * 1000, 2),
+            "buckets_ms": dict(zip(labels, self.counts)),
+        }
+
+
+class PollStats:
+    """Zbiorcze metryki jednego koordynatora."""
+
+    def __init__(self, inflight: int = 1) -> None:
+        self.inflight = max(1, inflight)
+        self.started = time.monotonic()
+        self.cycles = 0
+        self.cycle_time = LatencyHistogram()
+        self.last_cycle_time = 0.0     # s
+        self.cycle_overruns = 0
+        self.last_deferred = 0
+        self.deferred_total = 0
+        self.bus_idle_time = 0.0       # s – cisza odczekana w ostatnim cyklu
+        self.bus_busy_time = 0.0       # s – łącznie, wszystkie transakcje odczytu
+        self.bus_utilisation = 0.0     # % – od poprzedniego cyklu
+        self.errors: dict[str, int] = {}
+        self.blocks: dict[str, LatencyHistogram] = {}
+        self.registers: dict[str, LatencyHistogram] = {}
+        self._window_start = self.started
+        self._window_busy = 0.0
+
+    @property
+    def errors_total(self) -> int:
+        return sum(self.errors.values())
+
+    @property
+    def read_latency_ms(self) -> float | None:
+        """Średni czas udanego odczytu bloku (ms)."""
+        count = sum(h.count for h in self.blocks.values())
+        if not count:
+            return None
+        return round(sum(h.total for h in self.blocks.values()) / count * 1000, 2)
+
+    def record_read(
+        self, label: str, keys: Iterable[str], seconds: float, error: str | None = None
+    ) -> None:
+        """Jedna transakcja odczytu (blok albo pojedynczy rejestr)."""
+        self.bus_busy_time += seconds
+        self._window_busy += seconds
+        if error is not None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+            return
+        hist = self.blocks.get(label)
+        if hist is None:
+            hist = self.blocks[label] = LatencyHistogram()
+        hist.record(seconds)
+        for key in keys:
+            hist = self.registers.get(key)
+            if hist is None:
+                hist = self.registers[key] = LatencyHistogram()
+            hist.record(seconds)
+
+    def record_cycle(
+        self, elapsed: float, deferred: int, overrun: bool, idle: float
+    ) -> None:
+        """Koniec cyklu odczytu."""
+        now = time.monotonic()
+        self.cycles += 1
+        self.cycle_time.record(elapsed)
+        self.last_cycle_time = elapsed
+        self.last_deferred = deferred
+        self.deferred_total += deferred
+        self.cycle_overruns += overrun
+        self.bus_idle_time = idle
+        window = (now - self._window_start) * self.inflight
+        if window > 0:
+            self.bus_utilisation = round(min(100.0, self._window_busy / window * 100), 1)
+        self._window_start = now
+        self._window_busy = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "uptime_s": round(time.monotonic() - self.started, 1),
+            "cycles": self.cycles,
+            "cycle_time": self.cycle_time.as_dict(),
+            "last_cycle_ms": round(self.last_cycle_time * 1000, 2),
+            "cycle_overruns": self.cycle_overruns,
+            "last_deferred": self.last_deferred,
+            "deferred_total": self.deferred_total,
+            "bus_utilisation_pct": self.bus_utilisation,
+            "bus_busy_s": round(self.bus_busy_time, 3),
+            "bus_idle_last_cycle_s": round(self.bus_idle_time, 4),
+            "errors": dict(self.errors),
+            "blocks": {label: h.as_dict() for label, h in sorted(self.blocks.items())},
+            "registers": {key: h.as_dict() for key, h in sorted(self.registers.items())},
+        }
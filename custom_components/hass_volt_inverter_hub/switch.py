@@ -7,6 +7,7 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from .const import DOMAIN
 from .entities import VoltSwitch
+from .register_map import entity_platforms
 
 
 async def async_setup_entry(
@@ -19,6 +20,6 @@ async def async_setup_entry(
     entities = [
         VoltSwitch(coordinator, key)
         for key, meta in coordinator.registers.items()
-        if meta.get("type") == "switch" and meta.get("expose", True)
+        if "switch" in entity_platforms(meta)
     ]
     add_entities(entities, update_before_add=False)
\ No newline at end of file
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – śledzenie etapów odpytywania (Chrome trace-event JSON).
+
+• `tracer.span("decode", …)` wokół etapów cyklu i zapisów – gdy śledzenie
+  wyłączone, zwraca wspólny pusty kontekst (jedno sprawdzenie flagi)
+• włączane serwisem `start_trace` na N sekund; potem zdarzenia trafiają
+  do `<config>/volt_trace/trace-<czas>.json` (zapis w executorze)
+• plik otwiera chrome://tracing albo https://ui.perfetto.dev
+• pid = slave ID (osobny „proces” na inwerter), tid = zadanie asyncio
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextlib
+import json
+import logging
+import os
+import time
+from typing import Any
+
+from .const import DOMAIN
+
+DATA_TRACER = f"{DOMAIN}_tracer"    # hass.data: wspólny Tracer wszystkich wpisów
+DEFAULT_TRACE_DURATION = 30         # s
+MAX_TRACE_DURATION = 600            # s
+MAX_EVENTS = 200_000                # górna granica pamięci śledzenia
+
+_LOGGER = logging.getLogger(__name__)
+_NULL_SPAN = contextlib.nullcontext()
+
+
+class _Span:
+    __slots__ = ("_tracer", "_name", "_cat", "_pid", "_args", "_start")
+
+    def __init__(self, tracer: Tracer, name: str, cat: str, pid: int, args: dict) -> None:
+        self._tracer = tracer
+        self._name = name
+        self._cat = cat
+        self._pid = pid
+        self._args = args
+
+    def __enter__(self) -> _Span:
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self._tracer._complete(
+            self._name, self._cat, self._pid, self._start, time.perf_counter(), self._args
+        )
+
+
+class Tracer:
+    """Zbiera zdarzenia „X” (complete) w formacie Chrome trace-event."""
+
+    def __init__(self) -> None:
+        self.enabled = False
+        self.dropped = 0
+        self._events: list[dict[str, Any]] = []
+        self._origin = 0.0
+        self._tids: dict[int, int] = {}
+        self._pids: set[int] = set()
+        self._path = ""
+        self._stop_handle: asyncio.TimerHandle | None = None
+
+    def span(self, name: str, cat: str = "poll", pid: int = 0, **args: Any):
+        """Kontekst mierzący czas etapu (pusty, gdy śledzenie wyłączone)."""
+        if not self.enabled:
+            return _NULL_SPAN
+        return _Span(self, name, cat, pid, args)
+
+    def _complete(
+        self, name: str, cat: str, pid: int, start: float, end: float, args: dict
+    ) -> None:
+        if len(self._events) >= MAX_EVENTS:
+            self.dropped += 1
+            return
+        try:
+            task = asyncio.current_task()
+        except RuntimeError:
+            task = None
+        tid = self._tids.setdefault(id(task), len(self._tids) + 1)
+        self._pids.add(pid)
+        event = {
+            "name": name,
+            "cat": cat,
+            "ph": "X",
+            "ts": round((start - self._origin) * 1e6, 1),
+            "dur": round((end - start) * 1e6, 1),
+            "pid": pid,
+            "tid": tid,
+        }
+        if args:
+            event["args"] = args
+        self._events.append(event)
+
+    # ------------------------------------------------------------------
+    def async_start(self, hass, duration: float) -> str:
+        """Włącz śledzenie na `duration` s; zwraca ścieżkę przyszłego pliku."""
+        if self._stop_handle is not None:
+            self._stop_handle.cancel()
+        else:
+            self._events = []
+            self._tids = {}
+            self._pids = set()
+            self.dropped = 0
+            self._origin = time.perf_counter()
+            self._path = hass.config.path(
+                "volt_trace", time.strftime("trace-%Y%m%d-%H%M%S.json")
+            )
+        self.enabled = True
+        self._stop_handle = hass.loop.call_later(
+            duration, lambda: hass.async_create_task(self.async_stop(hass))
+        )
+        return self._path
+
+    async def async_stop(self, hass) -> str | None:
+        """Wyłącz śledzenie i zapisz plik (None, gdy nie było włączone)."""
+        if self._stop_handle is None:
+            return None
+        self._stop_handle.cancel()
+        self._stop_handle = None
+        self.enabled = False
+        events, self._events = self._events, []
+        meta = [
+            {"name": "process_name", "ph": "M", "pid": pid, "args": {"name": f"slave {pid}"}}
+            for pid in sorted(self._pids)
+        ]
+        path = self._path
+        await hass.async_add_executor_job(_write_trace, path, meta + events)
+        _LOGGER.info(
+            "Trace with %d events written to %s%s",
+            len(events), path,
+            f" ({self.dropped} dropped)" if self.dropped else "",
+        )
+        return path
+
+
+def _write_trace(path: str, events: list[dict[str, Any]]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"traceEvents": events, "displayTimeUnit": "ms"}, f)
@@ -0,0 +1,119 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – transport Modbus (RS-485 / TCP / RTU-over-TCP).
+
+• serial        – AsyncModbusSerialClient na lokalnym porcie (jak dotąd)
+• tcp           – Modbus TCP (MBAP) do bramki RS-485 ↔ Ethernet
+• rtu_over_tcp  – surowe ramki RTU tunelowane po TCP (tanie bramki)
+
+Dla bramek TCP trzymamy pulę trwałych połączeń (`max_inflight`). pymodbus
+serializuje transakcje w obrębie jednego klienta, więc kilka transakcji „w
+locie” = kilka połączeń – każde z własną przestrzenią transaction ID. Odczyty
+bloków nakładają się wtedy na opóźnienia sieci zamiast czekać jeden po drugim.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from pymodbus import FramerType
+from pymodbus.client import AsyncModbusSerialClient, AsyncModbusTcpClient
+
+TRANSPORT_SERIAL = "serial"
+TRANSPORT_TCP = "tcp"
+TRANSPORT_RTU_OVER_TCP = "rtu_over_tcp"
+TRANSPORTS = {
+    TRANSPORT_SERIAL: "RS-485 (serial)",
+    TRANSPORT_TCP: "Modbus TCP",
+    TRANSPORT_RTU_OVER_TCP: "RTU over TCP",
+}
+DEFAULT_TCP_PORT = 502
+DEFAULT_MAX_INFLIGHT = 1
+MAX_INFLIGHT = 8
+
+
+class ClientPool:
+    """Pula klientów TCP z tym samym API co pojedynczy klient pymodbus."""
+
+    def __init__(self, clients: list[Any]) -> None:
+        self._clients = clients
+        self._idle: asyncio.Queue = asyncio.Queue()
+        for client in clients:
+            self._idle.put_nowait(client)
+
+    @property
+    def max_inflight(self) -> int:
+        """Ile transakcji może być jednocześnie „w locie”."""
+        return len(self._clients)
+
+    @property
+    def connected(self) -> bool:
+        return any(client.connected for client in self._clients)
+
+    async def connect(self) -> bool:
+        results = await asyncio.gather(*(c.connect() for c in self._clients))
+        return any(results)
+
+    def close(self) -> None:
+        for client in self._clients:
+            client.close()
+
+    @asynccontextmanager
+    async def _lease(self) -> AsyncIterator[Any]:
+        client = await self._idle.get()
+        try:
+            yield client
+        finally:
+            self._idle.put_nowait(client)
+
+    async def read_holding_registers(self, address: int, count: int = 1, slave: int = 1):
+        async with self._lease() as client:
+            return await client.read_holding_registers(address, count, slave=slave)
+
+    async def read_input_registers(self, address: int, count: int = 1, slave: int = 1):
+        async with self._lease() as client:
+            return await client.read_input_registers(address, count, slave=slave)
+
+    async def write_register(self, address: int, value: int, slave: int = 1):
+        async with self._lease() as client:
+            return await client.write_register(address, value, slave=slave)
+
+    async def write_registers(self, address: int, values: list[int], slave: int = 1):
+        async with self._lease() as client:
+            return await client.write_registers(address, values, slave=slave)
+
+
+def create_client(cfg: dict[str, Any]) -> Any:
+    """Zbuduj klienta Modbus wg danych wpisu konfiguracji."""
+    transport = cfg.get("transport", TRANSPORT_SERIAL)
+    if transport == TRANSPORT_SERIAL:
+        return AsyncModbusSerialClient(
+            port=cfg["port"],
+            baudrate=cfg["baudrate"],
+            parity="N",
+            stopbits=1,
+            bytesize=8,
+            timeout=1,
+        )
+
+    framer = FramerType.RTU if transport == TRANSPORT_RTU_OVER_TCP else FramerType.SOCKET
+    inflight = max(1, min(cfg.get("max_inflight", DEFAULT_MAX_INFLIGHT), MAX_INFLIGHT))
+    return ClientPool(
+        [
+            AsyncModbusTcpClient(
+                cfg["host"],
+                port=cfg.get("tcp_port", DEFAULT_TCP_PORT),
+                framer=framer,
+                timeout=1,
+            )
+            for _ in range(inflight)
+        ]
+    )
+
+
+def describe(cfg: dict[str, Any]) -> str:
+    """Krótki opis połączenia – do tytułu wpisu i unique_id."""
+    if cfg.get("transport", TRANSPORT_SERIAL) == TRANSPORT_SERIAL:
+        return cfg["port"]
+    return f"{cfg['host']}:{cfg.get('tcp_port', DEFAULT_TCP_PORT)}"
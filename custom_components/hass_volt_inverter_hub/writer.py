@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+"""Volt Inverter Hub – kolejka zapisów (debounce + FC16).
+
+• kolejne zmiany tego samego adresu w oknie `debounce` → zapisujemy ostatnią
+• sąsiednie adresy łączymy w jeden `write_registers` (FC16, ≤ 123 rejestry);
+  pojedyncze adresy idą jako `write_register` (FC06)
+• po opróżnieniu kolejki – `on_flushed(zapisane, nieudane)` (odczyt kontrolny);
+  wołający dostają wynik dopiero po nim, czyli po potwierdzeniu stanu
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable
+
+DEFAULT_DEBOUNCE = 0.3         # s – okno zbierania zapisów (np. przeciąganie suwaka)
+MAX_REGISTERS_PER_WRITE = 123  # limit PDU dla FC16
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def plan_writes(
+    values: dict[int, int], multi: bool = True
+) -> list[tuple[int, list[int]]]:
+    """Pogrupuj {adres: wartość} w ciągłe serie (start, [wartości])."""
+    runs: list[tuple[int, list[int]]] = []
+    for addr in sorted(values):
+        if (
+            multi
+            and runs
+            and runs[-1][0] + len(runs[-1][1]) == addr
+            and len(runs[-1][1]) < MAX_REGISTERS_PER_WRITE
+        ):
+            runs[-1][1].append(values[addr])
+        else:
+            runs.append((addr, [values[addr]]))
+    return runs
+
+
+class WriteQueue:
+    """Zbiera zapisy i wysyła je paczkami po ustaniu zmian."""
+
+    def __init__(
+        self,
+        write_run: Callable[[int, list[int]], Awaitable[None]],
+        on_flushed: Callable[[dict[int, int], list[int]], Awaitable[None]],
+        debounce: float = DEFAULT_DEBOUNCE,
+        multi: bool = True,
+    ) -> None:
+        self._write_run = write_run
+        self._on_flushed = on_flushed
+        self.debounce = debounce
+        self.multi = multi
+        self._pending: dict[int, int] = {}
+        self._waiters: dict[int, list[asyncio.Future]] = {}
+        self._deadline = 0.0
+        self._task: asyncio.Task | None = None
+
+    def is_pending(self, addr: int) -> bool:
+        """True ⇒ zapis `addr` czeka w oknie debounce (jeszcze niewysłany)."""
+        return addr in self._pending
+
+    async def submit(self, addr: int, value: int) -> None:
+        """Dodaj zapis do kolejki; czeka, aż paczka z nim zostanie wysłana."""
+        loop = asyncio.get_running_loop()
+        self._pending[addr] = value
+        self._deadline = time.monotonic() + self.debounce
+        fut = loop.create_future()
+        self._waiters.setdefault(addr, []).append(fut)
+        if self._task is None:
+            self._task = loop.create_task(self._flush_later())
+        await fut
+
+    async def _flush_later(self) -> None:
+        # `_task` zostaje ustawione aż do końca wysyłki i odczytu kontrolnego –
+        # cancel() przy unloadzie musi móc przerwać (i doczekać) paczkę w locie;
+        # zapisy zgłoszone w trakcie wysyłki idą kolejną paczką tego zadania
+        try:
+            while self._pending:
+                # debounce „od ostatniej zmiany” – każdy submit przesuwa termin
+                while (delay := self._deadline - time.monotonic()) > 0:
+                    await asyncio.sleep(delay)
+
+                values, self._pending = self._pending, {}
+                waiters, self._waiters = self._waiters, {}
+                try:
+                    await self._flush(values, waiters)
+                finally:
+                    # przerwana paczka – wołający nie czekają w nieskończoność
+                    for futs in waiters.values():
+                        for fut in futs:
+                            if not fut.done():
+                                fut.cancel()
+        finally:
+            if self._task is asyncio.current_task():
+                self._task = None
+
+    async def _flush(
+        self, values: dict[int, int], waiters: dict[int, list[asyncio.Future]]
+    ) -> None:
+        written: dict[int, int] = {}
+        errors: dict[int, Exception] = {}
+        for start, run in plan_writes(values, self.multi):
+            try:
+                await self._write_run(start, run)
+            except Exception as exc:                    # noqa: BLE001
+                errors.update((start + i, exc) for i in range(len(run)))
+            else:
+                written.update((start + i, val) for i, val in enumerate(run))
+
+        try:
+            await self._on_flushed(written, list(errors))
+        except Exception:                               # noqa: BLE001
+            _LOGGER.exception("Post-write read-back failed")
+
+        for addr, futs in waiters.items():
+            for fut in futs:
+                if fut.done():
+                    continue
+                if addr in errors:
+                    fut.set_exception(errors[addr])
+                else:
+                    fut.set_result(None)
+
+    def cancel(self) -> asyncio.Task | None:
+        """Porzuć oczekujące zapisy (unload wpisu); zwraca przerwane zadanie.
+
+        Zadanie obejmuje także paczkę już wysyłaną – wołający powinien go
+        doczekać przed zamknięciem magistrali.
+        """
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+        for futs in self._waiters.values():
+            for fut in futs:
+                if not fut.done():
+                    fut.cancel()
+        self._waiters.clear()
+        self._pending.clear()
+        return task
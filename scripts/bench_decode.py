@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+"""Mikrobenchmark: dekodowanie bloku rejestrów – per-rejestr vs. jednym unpack.
+
+Uruchomienie (bez Home Assistanta – moduły ładowane bezpośrednio):
+
+    python scripts/bench_decode.py [--rounds 20000]
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import sys
+import timeit
+import types
+from pathlib import Path
+
+PKG_DIR = Path(__file__).resolve().parents[1] / "custom_components" / "hass_volt_inverter_hub"
+
+
+def _load_package():
+    """Zaimportuj moduły integracji z pominięciem __init__.py (wymaga HA)."""
+    pkg = types.ModuleType("volt_hub")
+    pkg.__path__ = [str(PKG_DIR)]
+    sys.modules["volt_hub"] = pkg
+    from volt_hub import decode, model_loader, planner, register_map  # noqa: PLC0415
+
+    return decode, model_loader, planner, register_map
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rounds", type=int, default=20000)
+    args = parser.parse_args()
+
+    decode, model_loader, planner, register_map = _load_package()
+    table = register_map.compile_registers(
+        model_loader.load_model("volt_sinus_pro_ultra_6000")["registers"]
+    )
+    blocks = planner.plan_reads(table.polled)
+    rng = random.Random(0)
+    payloads = [[rng.randrange(0x10000) for _ in range(b.count)] for b in blocks]
+    cache = decode.BlockDecoderCache()
+
+    def per_register() -> None:
+        data = {}
+        for block, regs in zip(blocks, payloads):
+            start = block.start
+            for spec in block.specs:
+                off = spec.addr - start
+                data[spec.key] = spec.decode(regs[off:off + spec.length])
+
+    def per_block() -> None:
+        data = {}
+        for block, regs in zip(blocks, payloads):
+            cache.get(block).decode_into(regs, data)
+
+    # oba warianty muszą dać identyczny wynik
+    ref, got = {}, {}
+    for block, regs in zip(blocks, payloads):
+        for spec in block.specs:
+            off = spec.addr - block.start
+            ref[spec.key] = spec.decode(regs[off:off + spec.length])
+        cache.get(block).decode_into(regs, got)
+    assert ref == got, "decoders disagree"
+
+    n_regs = sum(len(b.specs) for b in blocks)
+    print(f"{len(blocks)} blocks, {n_regs} registers, {args.rounds} rounds")
+    for name, fn in (("per-register", per_register), ("per-block", per_block)):
+        best = min(timeit.repeat(fn, number=args.rounds, repeat=5))
+        print(f"{name:>13}: {best / args.rounds * 1e6:8.2f} µs / full map")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,308 @@
+#!/usr/bin/env python
+"""Benchmark end-to-end: VoltCoordinator ↔ symulator inwertera (Modbus RTU, pty).
+
+Mierzy:
+• pełny cykl (wszystkie rejestry na raz) – czas, ramki, CPU procesu
+• pracę ciągłą (harmonogram jak w HA) – CPU i ramki na cykl (tick)
+• zapis z encji → potwierdzenie odczytem kontrolnym (z debounce kolejki)
+
+Symulator działa w osobnym procesie (scripts/simulator.py), więc CPU to
+wyłącznie koordynator + klient pymodbus. Wynik trafia do JSON-a
+`bench_results/polling-<wersja>-<git>.json` – nazwa niesie rewizję, przy której
+mierzono (wersja z manifestu sama nie odróżnia stanów drzewa, `--label` dopisuje
+opis); porównanie z wcześniejszym pomiarem:
+`--compare bench_results/snapshot-cbd1b93.json` (plik porównywany jest
+wczytywany przed pomiarem i nigdy nie jest domyślnie nadpisywany).
+
+Uruchomienie (wymaga Home Assistanta i pymodbus w środowisku):
+
+    python scripts/bench_polling.py [--cycles 20] [--duration 30] [--writes 10]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import json
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+import pymodbus  # noqa: E402
+from homeassistant.core import HomeAssistant  # noqa: E402
+from homeassistant.exceptions import HomeAssistantError  # noqa: E402
+
+from custom_components.hass_volt_inverter_hub.bus import (  # noqa: E402
+    BusManager,
+    rtu_frame_gap,
+)
+from custom_components.hass_volt_inverter_hub.coordinator import (  # noqa: E402
+    VoltCoordinator,
+)
+from custom_components.hass_volt_inverter_hub.derived import DerivedEngine  # noqa: E402
+from custom_components.hass_volt_inverter_hub.recorder import TrafficRecorder  # noqa: E402
+from custom_components.hass_volt_inverter_hub.model_loader import (  # noqa: E402
+    load_compiled,
+)
+from custom_components.hass_volt_inverter_hub.transport import create_client  # noqa: E402
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+import simulator  # noqa: E402
+
+# metryki porównywane z poprzednim wynikiem (ścieżka w JSON-ie)
+_COMPARED = (
+    ("full_cycle", "wall_ms", "mean"),
+    ("full_cycle", "frames", "mean"),
+    ("full_cycle", "cpu_ms", "mean"),
+    ("steady", "cpu_ms_per_tick"),
+    ("steady", "frames_per_tick"),
+    ("write_confirm_ms", "mean"),
+)
+
+
+def _summary(values: list[float]) -> dict[str, float]:
+    if not values:
+        return {}
+    ordered = sorted(values)
+    return {
+        "n": len(values),
+        "mean": round(statistics.fmean(values), 3),
+        "p50": round(ordered[len(ordered) // 2], 3),
+        "p95": round(ordered[min(len(ordered) - 1, int(len(ordered) * 0.95))], 3),
+        "max": round(ordered[-1], 3),
+    }
+
+
+def _start_simulator(args: argparse.Namespace) -> tuple[subprocess.Popen, str]:
+    cmd = [
+        sys.executable, str(Path(simulator.__file__)),
+        "--model", args.model, "--slave", str(args.slave), "--baud", str(args.baud),
+        "--latency", str(args.latency), "--jitter", str(args.jitter),
+        "--timeout-rate", str(args.timeout_rate), "--error-rate", str(args.error_rate),
+        "--seed", str(args.seed),
+    ]
+    if args.illegal:
+        cmd += ["--illegal", *map(str, args.illegal)]
+    if args.strict:
+        cmd.append("--strict")
+    proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, text=True)
+    line = proc.stdout.readline().strip()       # "<model> slave N @ /dev/pts/X"
+    if "@" not in line:
+        proc.kill()
+        raise SystemExit(f"simulator failed to start: {line!r}")
+    return proc, line.rsplit("@", 1)[1].strip()
+
+
+async def _bench(args: argparse.Namespace, port: str) -> dict:
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="volt_bench_"))
+    client = create_client({"port": port, "baudrate": args.baud})
+    if not await client.connect():
+        raise SystemExit(f"cannot open {port}")
+
+    model_cfg, table = load_compiled(args.model, None, adaptive=args.adaptive)
+    bus = BusManager(hass, client, rtu_frame_gap(args.baud), port)
+    bus.attach(args.slave)
+    coordinator = VoltCoordinator(
+        hass,
+        bus=bus,
+        slave=args.slave,
+        table=table,
+        derived=DerivedEngine(table),
+        max_gap=model_cfg.get("max_gap", 8),
+        cycle_budget=args.cycle_budget,
+    )
+    if args.record:
+        # nagranie do scripts/replay_traffic.py
+        coordinator.recorder = TrafficRecorder(args.record)
+    keys = [spec.key for spec in table.polled]
+    result: dict = {}
+
+    # ------- pierwszy odczyt ---------------------------------------------
+    started = time.perf_counter()
+    await coordinator.async_refresh()
+    result["first_refresh_ms"] = round((time.perf_counter() - started) * 1000, 2)
+
+    # ------- pełne cykle ---------------------------------------------------
+    wall, cpu, frames = [], [], []
+    for _ in range(args.cycles):
+        coordinator.async_refresh_keys(keys)
+        frames_before = bus.timing.frames
+        cpu_before = time.process_time()
+        started = time.perf_counter()
+        await coordinator.async_refresh()
+        wall.append((time.perf_counter() - started) * 1000)
+        cpu.append((time.process_time() - cpu_before) * 1000)
+        frames.append(bus.timing.frames - frames_before)
+    result["full_cycle"] = {
+        "wall_ms": _summary(wall),
+        "cpu_ms": _summary(cpu),
+        "frames": _summary(frames),
+    }
+
+    # ------- praca ciągła + zapisy ----------------------------------------
+    poller = asyncio.create_task(coordinator._async_poll_loop())
+    cycles_before = coordinator.stats.cycles
+    frames_before = bus.timing.frames
+    cpu_before = time.process_time()
+    await asyncio.sleep(args.duration)
+    ticks = coordinator.stats.cycles - cycles_before
+    result["steady"] = {
+        "duration_s": args.duration,
+        "ticks": ticks,
+        "cpu_ms_per_tick": round(
+            (time.process_time() - cpu_before) * 1000 / max(ticks, 1), 3
+        ),
+        "frames_per_tick": round((bus.timing.frames - frames_before) / max(ticks, 1), 2),
+    }
+
+    target = next(
+        (
+            spec
+            for spec in table.polled
+            if spec.fn == "holding"
+            and spec.length == 1
+            and spec.meta.get("is_write_reg")
+            and spec.meta.get("min") is not None
+        ),
+        None,
+    )
+    latencies = []
+    failed_writes = 0
+    if target is not None:
+        low = round(target.meta["min"] / target.scale)
+        high = round(target.meta["max"] / target.scale)
+        for i in range(args.writes):
+            started = time.perf_counter()
+            try:
+                await coordinator.async_queue_write(target.addr, high if i % 2 else low)
+            except HomeAssistantError:
+                failed_writes += 1          # wstrzyknięty błąd symulatora
+                continue
+            latencies.append((time.perf_counter() - started) * 1000)
+        result["write_register"] = target.key
+    result["write_confirm_ms"] = _summary(latencies)
+    result["write_failed"] = failed_writes
+
+    await coordinator.async_shutdown()
+    await poller                            # pętla kończy się po shutdown
+    if coordinator.recorder is not None:
+        await coordinator.recorder.async_flush(hass)
+    bus.close()
+    result["coordinator"] = {
+        k: v
+        for k, v in coordinator.stats.as_dict().items()
+        if k not in ("blocks", "registers")
+    }
+    return result
+
+
+def _dig(data: dict, path: tuple[str, ...]):
+    for part in path:
+        if not isinstance(data, dict) or part not in data:
+            return None
+        data = data[part]
+    return data
+
+
+def _compare(old: dict, new: dict) -> None:
+    print(f"\nvs {old.get('label') or old.get('version')} ({old.get('git')}):")
+    for path in _COMPARED:
+        before, after = _dig(old, path), _dig(new, path)
+        if not before or after is None:
+            continue
+        delta = (after - before) / before * 100
+        print(f"  {'.'.join(path):<28} {before:>10} → {after:<10} ({delta:+.1f} %)")
+
+
+def _git_rev() -> str | None:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    simulator.add_arguments(parser)
+    parser.add_argument("--cycles", type=int, default=20)
+    parser.add_argument("--duration", type=float, default=30.0, help="s of steady polling")
+    parser.add_argument("--writes", type=int, default=10)
+    parser.add_argument(
+        "--cycle-budget", type=float, default=float("inf"),
+        help="s; default unlimited so a full cycle is one refresh",
+    )
+    parser.add_argument(
+        "--adaptive", action="store_true", help="adaptive poll intervals (entry option)"
+    )
+    parser.add_argument(
+        "--output", type=Path,
+        help="JSON file (default: bench_results/polling-<version>-<git>.json)",
+    )
+    parser.add_argument("--compare", type=Path, help="previous JSON result")
+    parser.add_argument("--label", help="what was measured (stored in the result)")
+    parser.add_argument("--record", type=Path, help="also record the traffic log here")
+    args = parser.parse_args()
+
+    manifest = json.loads(
+        (ROOT / "custom_components" / "hass_volt_inverter_hub" / "manifest.json").read_text()
+    )
+    # wynik odniesienia wczytujemy PRZED pomiarem – błędna ścieżka nie marnuje
+    # przebiegu, a zapis wyniku nie może już zmienić tego, z czym porównujemy
+    baseline = json.loads(args.compare.read_text()) if args.compare else None
+    git = _git_rev()
+    output = args.output or ROOT / "bench_results" / (
+        f"polling-{manifest['version']}-{git or time.strftime('%Y%m%d%H%M%S')}.json"
+    )
+    if (
+        args.compare
+        and args.output is None
+        and output.resolve() == args.compare.resolve()
+    ):
+        raise SystemExit(
+            f"{output} is the --compare baseline; pass --output to overwrite it"
+        )
+
+    proc, port = _start_simulator(args)
+    try:
+        result = asyncio.run(_bench(args, port))
+    finally:
+        proc.terminate()
+        proc.wait()
+
+    report = {
+        "version": manifest["version"],
+        "git": git,
+        "label": args.label,
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "python": platform.python_version(),
+        "pymodbus": pymodbus.__version__,
+        "params": {
+            k: (sorted(v) if isinstance(v, set) else v)
+            for k, v in simulator.options_from_args(args).items()
+        }
+        | {"cycles": args.cycles, "duration": args.duration, "writes": args.writes,
+           "cycle_budget": None if args.cycle_budget == float("inf") else args.cycle_budget,
+           "adaptive": args.adaptive},
+        **result,
+    }
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2) + "\n")
+
+    print(json.dumps({k: report[k] for k in ("full_cycle", "steady", "write_confirm_ms")}, indent=2))
+    print(f"→ {output}")
+    if baseline is not None:
+        _compare(baseline, report)
+
+
+if __name__ == "__main__":
+    main()
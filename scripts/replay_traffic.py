@@ -0,0 +1,145 @@
+#!/usr/bin/env python
+"""Odtwarzanie nagranego ruchu Modbus przez VoltCoordinator (bez sprzętu).
+
+Log z rejestratora (opcje wpisu → „Nagrywaj ruch Modbus”, plik
+`<config>/volt_traffic/<entry_id>.vrec`) dzielony jest na cykle wg przerw
+w ruchu. Dla każdego cyklu ReplayClient nanosi nagrane odpowiedzi na obraz
+rejestrów, a koordynator czyta te same rejestry co w oryginale – dekodowanie,
+composite i rozsyłanie do encji (licznik wywołań słuchaczy) idą prawdziwą
+ścieżką. Domyślnie najszybciej jak się da; `--realtime` zachowuje odstępy.
+
+Uruchomienie (wymaga Home Assistanta i pymodbus w środowisku):
+
+    python scripts/replay_traffic.py LOG [--realtime] [--speed 2] [--profile]
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import cProfile
+import pstats
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+sys.path.insert(0, str(ROOT))
+
+from homeassistant.core import HomeAssistant  # noqa: E402
+
+from custom_components.hass_volt_inverter_hub.bus import BusManager  # noqa: E402
+from custom_components.hass_volt_inverter_hub.coordinator import (  # noqa: E402
+    VoltCoordinator,
+)
+from custom_components.hass_volt_inverter_hub.derived import DerivedEngine  # noqa: E402
+from custom_components.hass_volt_inverter_hub.recorder import (  # noqa: E402
+    FC_READ_INPUT,
+    FC_WRITE_MULTIPLE,
+    FC_WRITE_SINGLE,
+    ReplayClient,
+    TrafficRecord,
+    read_log,
+)
+from custom_components.hass_volt_inverter_hub.model_loader import (  # noqa: E402
+    load_compiled,
+)
+
+
+def split_cycles(records: list[TrafficRecord], gap: float) -> list[list[TrafficRecord]]:
+    """Podziel log na cykle – nowy cykl po przerwie > `gap` s."""
+    cycles: list[list[TrafficRecord]] = []
+    last_end = None
+    for rec in records:
+        if last_end is None or rec.ts - last_end > gap:
+            cycles.append([])
+        cycles[-1].append(rec)
+        last_end = rec.ts + rec.duration
+    return cycles
+
+
+async def _replay(args: argparse.Namespace) -> None:
+    records = list(read_log(args.log))
+    if not records:
+        raise SystemExit("no records")
+    slave = args.slave if args.slave is not None else records[0].slave
+    records = [rec for rec in records if rec.slave == slave]
+    cycles = split_cycles(records, args.gap)
+
+    _model_cfg, table = load_compiled(args.model, None)
+    hass = HomeAssistant(tempfile.mkdtemp(prefix="volt_replay_"))
+    client = ReplayClient(records)
+    bus = BusManager(hass, client, 0.0, "replay")
+    bus.attach(slave)
+    coordinator = VoltCoordinator(
+        hass, bus=bus, slave=slave, table=table, derived=DerivedEngine(table),
+        cycle_budget=float("inf"),
+    )
+
+    # „encje” – liczymy powiadomienia, jak zrobiłby to HA
+    notified = 0
+
+    def on_update() -> None:
+        nonlocal notified
+        notified += 1
+
+    for key in table.by_key:
+        coordinator.async_add_key_listener(key, on_update)
+
+    by_addr = table.by_addr
+    profiler = cProfile.Profile() if args.profile else None
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    t0 = cycles[0][0].ts
+
+    for cycle in cycles:
+        if args.realtime:
+            delay = (cycle[0].ts - t0) / args.speed - (time.perf_counter() - wall_start)
+            if delay > 0:
+                await asyncio.sleep(delay)
+        client.advance(cycle[-1].ts)
+        keys = set()
+        for rec in cycle:
+            if rec.fc in (FC_WRITE_SINGLE, FC_WRITE_MULTIPLE):
+                continue
+            fn = "input" if rec.fc == FC_READ_INPUT else "holding"
+            for addr in range(rec.addr, rec.addr + rec.count):
+                if (spec := by_addr.get((fn, addr))) is not None:
+                    keys.add(spec.key)
+        if not keys:
+            continue
+        coordinator.async_refresh_keys(keys)
+        if profiler is not None:
+            profiler.enable()
+        await coordinator.async_refresh()
+        if profiler is not None:
+            profiler.disable()
+
+    wall = time.perf_counter() - wall_start
+    cpu = time.process_time() - cpu_start
+    stats = coordinator.stats
+    print(f"{len(records)} records, {len(cycles)} cycles "
+          f"({records[-1].ts - t0:.1f} s recorded)")
+    print(f"replayed in {wall:.3f} s wall, {cpu * 1000:.1f} ms CPU, "
+          f"{cpu / max(stats.cycles, 1) * 1000:.3f} ms CPU / cycle")
+    print(f"{stats.cycles} coordinator cycles, {notified} entity updates, "
+          f"errors {stats.errors or '-'}")
+    if profiler is not None:
+        pstats.Stats(profiler).sort_stats("cumulative").print_stats(25)
+    bus.close()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("log", type=Path)
+    parser.add_argument("--model", default="volt_sinus_pro_ultra_6000")
+    parser.add_argument("--slave", type=int, help="default: slave of the first record")
+    parser.add_argument("--gap", type=float, default=0.2, help="s of silence between cycles")
+    parser.add_argument("--realtime", action="store_true")
+    parser.add_argument("--speed", type=float, default=1.0, help="with --realtime")
+    parser.add_argument("--profile", action="store_true", help="cProfile the refreshes")
+    asyncio.run(_replay(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,305 @@
+#!/usr/bin/env python
+"""Symulator inwertera Volt – slave Modbus RTU na wirtualnej parze portów (pty).
+
+• serwer pymodbus (RTU) na jednym końcu „kabla null-modem” z dwóch pty,
+  klient (integracja / benchmark) otwiera drugi koniec
+• rejestry z models/<model>.yaml – wartości startowe z opcji /
+  zakresu min–max, pomiary lekko „pływają” przy każdym odczycie
+• opóźnienie odpowiedzi: stałe + jitter + czas transmisji ramki przy `--baud`
+• wstrzykiwanie błędów: brak odpowiedzi (timeout), wyjątek urządzenia,
+  nieobsługiwane adresy (`--illegal`), tryb ścisły bez dziur (`--strict`)
+
+Uruchomienie (bez Home Assistanta – moduły ładowane bezpośrednio):
+
+    python scripts/simulator.py [--latency 0.02] [--timeout-rate 0.01]
+
+Wypisuje ścieżkę portu klienta i działa do Ctrl+C.
+"""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import os
+import random
+import sys
+import tty
+import types
+from pathlib import Path
+
+from pymodbus import FramerType
+from pymodbus.datastore import (
+    ModbusSequentialDataBlock,
+    ModbusServerContext,
+    ModbusSlaveContext,
+    ModbusSparseDataBlock,
+)
+from pymodbus.exceptions import NoSuchSlaveException
+from pymodbus.server import ModbusSerialServer
+
+PKG_DIR = Path(__file__).resolve().parents[1] / "custom_components" / "hass_volt_inverter_hub"
+DEFAULT_MODEL = "volt_sinus_pro_ultra_6000"
+
+_BITS_PER_CHAR = 11
+_FC_TO_FN = {3: "holding", 4: "input", 6: "holding", 16: "holding"}
+_READ_STORES = {3: "h", 4: "i"}   # FC odczytu → magazyn pymodbus
+
+
+def _load_package():
+    """Zaimportuj moduły integracji z pominięciem __init__.py (wymaga HA)."""
+    if "volt_hub" not in sys.modules:
+        pkg = types.ModuleType("volt_hub")
+        pkg.__path__ = [str(PKG_DIR)]
+        sys.modules["volt_hub"] = pkg
+    from volt_hub import model_loader, register_map  # noqa: PLC0415
+
+    return model_loader, register_map
+
+
+def initial_values(registers: dict, seed: int = 0) -> dict[tuple[str, int], int]:
+    """Wartości startowe {(fn, adres): słowo} dla rejestrów z mapy."""
+    _model_loader, register_map = _load_package()
+    table = register_map.compile_registers(registers)
+    rng = random.Random(seed)
+    words: dict[tuple[str, int], int] = {}
+    for spec in table.polled:
+        meta = spec.meta
+        if meta.get("options"):
+            raw = next(iter(meta["options"]))
+        elif meta.get("min") is not None and meta.get("max") is not None:
+            raw = round((meta["min"] + meta["max"]) / 2 / spec.scale)
+        else:
+            raw = rng.randrange(1, 500)
+        raw &= (1 << (16 * spec.length)) - 1
+        for i in range(spec.length):
+            shift = 16 * (spec.length - 1 - i)
+            words[(spec.fn, spec.addr + i)] = (raw >> shift) & 0xFFFF
+    return words
+
+
+def measurement_addresses(registers: dict) -> dict[str, list[int]]:
+    """{fn: [adresy]} pomiarów – rejestry tylko-do-odczytu bez listy opcji.
+
+    Dla rejestrów 2-słowowych – młodsze słowo (zmiana o ±1 jednostkę).
+    """
+    _model_loader, register_map = _load_package()
+    table = register_map.compile_registers(registers)
+    addrs: dict[str, list[int]] = {}
+    for spec in table.polled:
+        if spec.config or spec.meta.get("options"):
+            continue
+        addrs.setdefault(spec.fn, []).append(spec.addr + spec.length - 1)
+    return {fn: sorted(a) for fn, a in addrs.items()}
+
+
+class SimulatedContext(ModbusSlaveContext):
+    """Kontekst slave'a z opóźnieniem, jitterem i wstrzykiwaniem błędów."""
+
+    def __init__(
+        self,
+        words: dict[tuple[str, int], int],
+        *,
+        strict: bool = False,
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        baudrate: int = 9600,
+        timeout_rate: float = 0.0,
+        error_rate: float = 0.0,
+        illegal: set[int] | frozenset[int] = frozenset(),
+        volatility: float = 0.2,
+        measurements: dict[str, list[int]] | None = None,
+        seed: int = 0,
+    ) -> None:
+        stores = {}
+        for fn in ("holding", "input"):
+            values = {addr: val for (f, addr), val in words.items() if f == fn}
+            if strict or not values:
+                stores[fn] = ModbusSparseDataBlock(values or {0: 0})
+            else:
+                # „prawdziwy” inwerter zwykle oddaje zera w dziurach mapy
+                lo, hi = min(values), max(values)
+                stores[fn] = ModbusSequentialDataBlock(
+                    lo, [values.get(a, 0) for a in range(lo, hi + 1)]
+                )
+        super().__init__(hr=stores["holding"], ir=stores["input"], zero_mode=True)
+        self.latency = latency
+        self.jitter = jitter
+        self.char_time = _BITS_PER_CHAR / baudrate
+        self.timeout_rate = timeout_rate
+        self.error_rate = error_rate
+        self.illegal = set(illegal)
+        self.volatility = volatility
+        # fn → adresy, które „pływają”; bez listy – wszystkie słowa danej funkcji
+        if measurements is None:
+            measurements = {}
+            for fn, addr in sorted(words):
+                measurements.setdefault(fn, []).append(addr)
+        self._measurements = measurements
+        self._rng = random.Random(seed)
+        self.requests = 0
+
+    def validate(self, fc_as_hex, address, count=1):
+        if self.illegal and not self.illegal.isdisjoint(range(address, address + count)):
+            return False
+        return super().validate(fc_as_hex, address, count)
+
+    async def _respond_later(self, payload_words: int) -> None:
+        self.requests += 1
+        rng = self._rng
+        if rng.random() < self.timeout_rate:
+            # ignore_missing_slaves=True ⇒ serwer nic nie odsyła
+            raise NoSuchSlaveException("injected timeout")
+        if rng.random() < self.error_rate:
+            raise RuntimeError("injected device failure")   # → SlaveFailure (0x04)
+        # ramka odpowiedzi RTU: adres + fn + [bajty] + dane + CRC
+        delay = self.latency + rng.uniform(0, self.jitter)
+        delay += (5 + 2 * payload_words) * self.char_time
+        await asyncio.sleep(delay)
+
+    async def async_getValues(self, fc_as_hex, address, count=1):
+        await self._respond_later(count)
+        if fc_as_hex in _READ_STORES:
+            self._drift(fc_as_hex)
+        return self.getValues(fc_as_hex, address, count)
+
+    async def async_setValues(self, fc_as_hex, address, values):
+        await self._respond_later(2)
+        self.setValues(fc_as_hex, address, values)
+
+    def _drift(self, fc_as_hex: int) -> None:
+        """Część pomiarów czytanej funkcji zmienia się o ±1 – jest co rozsyłać."""
+        addrs = self._measurements.get(_FC_TO_FN[fc_as_hex])
+        if not addrs:
+            return
+        rng = self._rng
+        store = self.store[_READ_STORES[fc_as_hex]]
+        for addr in rng.sample(addrs, int(len(addrs) * self.volatility)):
+            val = store.getValues(addr, 1)[0]
+            store.setValues(addr, [(val + rng.choice((-1, 1))) & 0xFFFF])
+
+
+class VirtualSerialPair:
+    """Dwa pty połączone „null-modemem” – ścieżki `server_port` i `client_port`."""
+
+    def __init__(self) -> None:
+        self._master_a, self._slave_a = os.openpty()
+        self._master_b, self._slave_b = os.openpty()
+        for fd in (self._slave_a, self._slave_b):
+            tty.setraw(fd)
+        self.server_port = os.ttyname(self._slave_a)
+        self.client_port = os.ttyname(self._slave_b)
+
+    def start(self, loop: asyncio.AbstractEventLoop) -> None:
+        loop.add_reader(self._master_a, self._pump, self._master_a, self._master_b)
+        loop.add_reader(self._master_b, self._pump, self._master_b, self._master_a)
+
+    @staticmethod
+    def _pump(src: int, dst: int) -> None:
+        try:
+            os.write(dst, os.read(src, 4096))
+        except OSError:
+            pass
+
+    def close(self, loop: asyncio.AbstractEventLoop) -> None:
+        for fd in (self._master_a, self._master_b):
+            loop.remove_reader(fd)
+        for fd in (self._master_a, self._master_b, self._slave_a, self._slave_b):
+            os.close(fd)
+
+
+class InverterSimulator:
+    """Symulator gotowy do użycia w benchmarku: `await start()` / `await stop()`."""
+
+    def __init__(self, model: str = DEFAULT_MODEL, slave: int = 4, **options) -> None:
+        model_loader, _register_map = _load_package()
+        self.model = model
+        self.slave = slave
+        self.baudrate = options.get("baudrate", 9600)
+        registers = model_loader.load_model(model)["registers"]
+        self.context = SimulatedContext(
+            initial_values(registers, options.get("seed", 0)),
+            measurements=measurement_addresses(registers),
+            **options,
+        )
+        self.pair = VirtualSerialPair()
+        self._server: ModbusSerialServer | None = None
+        self._task: asyncio.Task | None = None
+
+    @property
+    def port(self) -> str:
+        """Ścieżka portu dla klienta."""
+        return self.pair.client_port
+
+    async def start(self) -> None:
+        loop = asyncio.get_running_loop()
+        self.pair.start(loop)
+        self._server = ModbusSerialServer(
+            ModbusServerContext(slaves={self.slave: self.context}, single=False),
+            framer=FramerType.RTU,
+            port=self.pair.server_port,
+            baudrate=self.baudrate,
+            ignore_missing_slaves=True,
+        )
+        self._task = loop.create_task(self._server.serve_forever())
+        await asyncio.sleep(0.2)            # serwer otwiera port
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            await self._server.shutdown()
+        if self._task is not None:
+            self._task.cancel()
+        self.pair.close(asyncio.get_running_loop())
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Opcje symulatora – wspólne ze skryptem benchmarku."""
+    parser.add_argument("--model", default=DEFAULT_MODEL)
+    parser.add_argument("--slave", type=int, default=4)
+    parser.add_argument("--baud", type=int, default=9600, help="emulated line speed")
+    parser.add_argument("--latency", type=float, default=0.02, help="s, device think time")
+    parser.add_argument("--jitter", type=float, default=0.01, help="s, uniform 0..jitter")
+    parser.add_argument("--timeout-rate", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--illegal", type=int, nargs="*", default=[], help="addresses answering 0x02"
+    )
+    parser.add_argument(
+        "--strict", action="store_true", help="gaps in the map answer 0x02"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+
+
+def options_from_args(args: argparse.Namespace) -> dict:
+    return {
+        "baudrate": args.baud,
+        "latency": args.latency,
+        "jitter": args.jitter,
+        "timeout_rate": args.timeout_rate,
+        "error_rate": args.error_rate,
+        "illegal": set(args.illegal),
+        "strict": args.strict,
+        "seed": args.seed,
+    }
+
+
+async def _run(args: argparse.Namespace) -> None:
+    sim = InverterSimulator(args.model, args.slave, **options_from_args(args))
+    await sim.start()
+    print(f"{args.model} slave {args.slave} @ {sim.port}", flush=True)
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await sim.stop()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    add_arguments(parser)
+    try:
+        asyncio.run(_run(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()